@@ -0,0 +1,103 @@
+"""Batch runs of a template against many rows of inputs."""
+import csv
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from tackle.session import SETTINGS_KWARGS, get_process_session, run_in_worker
+
+from typing import List, Union
+
+logger = logging.getLogger(__name__)
+
+
+def read_rows(path: str) -> List[dict]:
+    """Read the rows of `overwrite_inputs` from a CSV or JSON lines file."""
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            return [dict(i) for i in csv.DictReader(f)]
+        return [json.loads(i) for i in f if i.strip()]
+
+
+def _run_row(cwd: str, index: int, kwargs: dict) -> dict:
+    """Run a single row and return its entry in the manifest."""
+    entry = {
+        'row': index,
+        'overwrite_inputs': kwargs['overwrite_inputs'],
+        'output': None,
+        'error': None,
+    }
+    try:
+        entry['output'] = run_in_worker(cwd, kwargs)
+    except Exception as e:
+        logger.debug(f"Row {index} failed - {e}")
+        entry['error'] = f"{e.__class__.__name__}: {e}"
+    return entry
+
+
+def tackle_batch(
+    rows: Union[str, List[dict]],
+    manifest: str = None,
+    workers: int = None,
+    **kwargs,
+) -> List[dict]:
+    """
+    Run a template once per row of inputs, without prompting.
+
+    The first row is run in this process to warm its session, ie read the
+    settings, gather the providers and compile the templates of the template,
+    before the other rows are run in a pool of worker processes forked from it.
+
+    :param rows: Path to a CSV or JSON lines file of `overwrite_inputs`, or a list
+        of them.
+    :param manifest: File to write the entry of each row to as JSON lines.
+        Defaults to `<rows file>.manifest.jsonl` for a rows file.
+    :param workers: Number of worker processes, defaults to the number of CPUs.
+    :param kwargs: Arguments to `tackle.main.tackle` shared by all the rows.
+
+    :return List of the entry of each row with its `row` index,
+        `overwrite_inputs`, `output` and `error`.
+    """
+    if isinstance(rows, str):
+        if manifest is None:
+            manifest = os.path.splitext(rows)[0] + '.manifest.jsonl'
+        rows = read_rows(rows)
+    kwargs = {**kwargs, 'no_input': True}
+    cwd = os.getcwd()
+
+    entries = []
+    if rows:
+        if not any(kwargs.get(i) for i in SETTINGS_KWARGS):
+            # Inherited by the forked workers
+            get_process_session()
+        try:
+            entries.append(_run_row(cwd, 0, dict(kwargs, overwrite_inputs=rows[0])))
+        finally:
+            # Changed by the row as it would be in a worker
+            os.chdir(cwd)
+    if len(rows) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_run_row, cwd, i, dict(kwargs, overwrite_inputs=row))
+                for i, row in enumerate(rows[1:], start=1)
+            ]
+            for i, future in enumerate(futures, start=1):
+                try:
+                    entries.append(future.result())
+                except Exception as e:
+                    # ie the output couldn't be sent back
+                    entries.append(
+                        {
+                            'row': i,
+                            'overwrite_inputs': rows[i],
+                            'output': None,
+                            'error': f"{e.__class__.__name__}: {e}",
+                        }
+                    )
+
+    if manifest:
+        with open(manifest, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, default=str) + '\n')
+    return entries
@@ -22,6 +22,8 @@ from tackle.exceptions import (
 )
 from tackle.utils.log import configure_logger
 from tackle.main import tackle
+from tackle.batch import tackle_batch
+from tackle.server import serve as tackle_serve
 from tackle.parser.settings import get_settings
 
 
@@ -166,6 +168,35 @@ def list_installed_templates(default_config, passed_config_file):
     default=None,
     help='Reruns the inputs from a local file "<record file>.yml".',
 )
+@click.option(
+    '--incremental',
+    is_flag=True,
+    help='Reuse the outputs of the hooks whose inputs did not change since the '
+    'last run, recorded in a local file "<template name>.incremental.pickle".',
+)
+@click.option(
+    '--incremental-file',
+    type=click.Path(),
+    default=None,
+    help='Record the outputs for incremental runs in this file instead.',
+)
+@click.option(
+    '--checkpoint',
+    is_flag=True,
+    help='Journal the output of each key to a local file '
+    '"<template name>.checkpoint.pickle" to resume the run if it fails.',
+)
+@click.option(
+    '--checkpoint-file',
+    type=click.Path(),
+    default=None,
+    help='Journal the output of each key to this file instead.',
+)
+@click.option(
+    '--resume',
+    is_flag=True,
+    help='Resume a failed checkpointed run from the key that failed.',
+)
 @click.option(
     '-f',
     '--overwrite-if-exists',
@@ -206,6 +237,64 @@ def list_installed_templates(default_config, passed_config_file):
     default='yes',
     help='Accept pre/post hooks',
 )
+@click.option(
+    '--hook-workers',
+    type=int,
+    default=None,
+    help='Run hooks that do not depend on each other in this many threads.',
+)
+@click.option(
+    '--batch',
+    type=click.Path(exists=True),
+    default=None,
+    help='Run the template once per row of overwrite inputs in this CSV or JSON '
+    'lines file, without prompting.',
+)
+@click.option(
+    '--batch-manifest',
+    type=click.Path(),
+    default=None,
+    help='Write the output or error of each row to this file instead of '
+    '"<batch file>.manifest.jsonl".',
+)
+@click.option(
+    '--batch-workers',
+    type=int,
+    default=None,
+    help='Number of processes to run the rows in, defaults to the number of CPUs.',
+)
+@click.option(
+    '--serve',
+    is_flag=True,
+    help='Serve tackle runs to local clients until interrupted instead of running '
+    'a template, see `tackle.server`.',
+)
+@click.option(
+    '--serve-socket',
+    type=click.Path(),
+    default=None,
+    help='With `--serve`, listen on this unix socket instead of a port.',
+)
+@click.option(
+    '--serve-port',
+    type=int,
+    default=8000,
+    help='With `--serve`, port to listen on at localhost.',
+)
+@click.option(
+    '--serve-workers',
+    type=int,
+    default=None,
+    help='With `--serve`, number of processes to run the requests in, '
+    'defaults to the number of CPUs.',
+)
+@click.option(
+    '--serve-token-file',
+    type=click.Path(),
+    default=None,
+    help='With `--serve`, write a new token to this file that the requests '
+    'then need to send as "Authorization: Bearer <token>".',
+)
 @click.option(
     '-l', '--list-installed', is_flag=True, help='List currently installed templates.'
 )
@@ -229,6 +318,11 @@ def main(
     record_file,
     rerun,
     rerun_file,
+    incremental,
+    incremental_file,
+    checkpoint,
+    checkpoint_file,
+    resume,
     overwrite_if_exists,
     skip_if_file_exists,
     output_dir,
@@ -236,6 +330,15 @@ def main(
     default_config,
     debug_file,
     accept_hooks,
+    hook_workers,
+    batch,
+    batch_manifest,
+    batch_workers,
+    serve,
+    serve_socket,
+    serve_port,
+    serve_workers,
+    serve_token_file,
     list_installed,
     rich_trace,
 ):
@@ -249,6 +352,18 @@ def main(
         list_installed_templates(default_config, config_file)
         sys.exit(0)
 
+    if serve:
+        configure_logger(
+            stream_level='DEBUG' if verbose else 'INFO', debug_file=debug_file
+        )
+        tackle_serve(
+            socket_path=serve_socket,
+            port=serve_port,
+            workers=serve_workers,
+            token_file=serve_token_file,
+        )
+        sys.exit(0)
+
     # Raising usage, after all commands that should work without args.
     if not template or template.lower() == 'help':
         click.echo(click.get_current_context().get_help())
@@ -269,6 +384,36 @@ def main(
         record = record_file
     if rerun_file:
         rerun = rerun_file
+    if incremental_file:
+        incremental = incremental_file
+    if checkpoint_file:
+        checkpoint = checkpoint_file
+
+    if batch:
+        entries = tackle_batch(
+            batch,
+            manifest=batch_manifest,
+            workers=batch_workers,
+            template=template,
+            checkout=checkout,
+            context_file=context_file,
+            context_key=context_key,
+            existing_context=existing_context,
+            overwrite_if_exists=overwrite_if_exists,
+            output_dir=output_dir,
+            config_file=config_file,
+            default_config=default_config,
+            password=os.environ.get('COOKIECUTTER_REPO_PASSWORD'),
+            directory=directory,
+            skip_if_file_exists=skip_if_file_exists,
+            accept_hooks=_accept_hooks,
+            hook_workers=hook_workers,
+        )
+        errors = [i for i in entries if i['error']]
+        click.echo(f"Ran {len(entries)} rows, {len(errors)} failed.")
+        for i in errors:
+            click.echo(f"Row {i['row']}: {i['error']}")
+        sys.exit(1 if errors else 0)
 
     try:
         tackle(
@@ -283,6 +428,9 @@ def main(
             replay=replay,
             record=record,
             rerun=rerun,
+            incremental=incremental,
+            checkpoint=checkpoint,
+            resume=resume,
             overwrite_if_exists=overwrite_if_exists,
             output_dir=output_dir,
             config_file=config_file,
@@ -292,6 +440,7 @@ def main(
             skip_if_file_exists=skip_if_file_exists,
             accept_hooks=_accept_hooks,
             calling_directory=os.path.curdir,
+            hook_workers=hook_workers,
         )
     except (
         OutputDirExistsException,
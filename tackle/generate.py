@@ -9,7 +9,6 @@ from binaryornot.check import is_binary
 from jinja2 import FileSystemLoader
 from jinja2.exceptions import TemplateSyntaxError, UndefinedError
 
-from tackle.render.environment import StrictEnvironment
 from tackle.exceptions import (
     FailedHookException,
     NonTemplatedInputDirException,
@@ -19,7 +18,7 @@ from tackle.exceptions import (
 from tackle.hooks import run_hook
 from tackle.utils.paths import rmtree, make_sure_path_exists
 from tackle.utils.context_manager import work_in
-from tackle.render import build_render_context
+from tackle.render import build_render_context, get_environment, render_template
 
 from typing import TYPE_CHECKING
 
@@ -83,7 +82,7 @@ def generate_file(project_dir, context: 'Context', output: 'Output'):
 
     render_context = build_render_context(context)
 
-    outfile = os.path.join(project_dir, outfile_tmpl.render(**render_context))
+    outfile = os.path.join(project_dir, render_template(outfile_tmpl, render_context))
     file_name_is_empty = os.path.isdir(outfile)
     if file_name_is_empty:
         logger.debug('The resulting file name is empty: %s', outfile)
@@ -115,7 +114,7 @@ def generate_file(project_dir, context: 'Context', output: 'Output'):
             # information about syntax error location
             exception.translated = False
             raise
-        rendered_file = tmpl.render(**render_context)
+        rendered_file = render_template(tmpl, render_context)
 
         # Detect original file newline to output the rendered file
         # note: newline='' ensures newlines are not converted
@@ -141,7 +140,7 @@ def render_and_create_dir(dirname, context: 'Context', output: 'Output'):
     """Render name of a directory, create the directory, return its path."""
     name_tmpl = output.env.from_string(dirname)
     render_context = build_render_context(context)
-    rendered_dirname = name_tmpl.render(render_context)
+    rendered_dirname = render_template(name_tmpl, render_context)
 
     dir_to_create = os.path.normpath(os.path.join(output.output_dir, rendered_dirname))
 
@@ -244,9 +243,7 @@ def generate_files(output: 'Output', context: 'Context', source: 'Source'):
 
         unrendered_dir = os.path.split(template_dir)[1]
         ensure_dir_is_templated(unrendered_dir)
-        output.env = StrictEnvironment(
-            context=context.input_dict, keep_trailing_newline=True, **envvars
-        )
+        output.env = get_environment(context, keep_trailing_newline=True, **envvars)
         try:
             project_dir, output_directory_created = render_and_create_dir(
                 unrendered_dir, context, output
@@ -278,7 +275,9 @@ def generate_files(output: 'Output', context: 'Context', source: 'Source'):
             )
 
         with work_in(template_dir):
-            output.env.loader = FileSystemLoader('.')
+            # Overlay the shared environment so the loader stays local to this
+            # template directory
+            output.env = output.env.overlay(loader=FileSystemLoader('.'))
 
             for root, dirs, files in os.walk('.'):
                 # We must separate the two types of dirs into different lists.
@@ -7,7 +7,7 @@ import sys
 import tempfile
 
 import tackle.utils.paths
-from tackle.render.environment import StrictEnvironment
+from tackle.render import get_environment
 from tackle.exceptions import FailedHookException
 
 from typing import TYPE_CHECKING
@@ -118,7 +118,9 @@ def run_script_with_context(script_path, cwd, context: 'Context'):
             render_context = {'cookiecutter': context.output_dict}
             render_context.update(context.output_dict)
 
-        env = StrictEnvironment(context=render_context, keep_trailing_newline=True)
+        env = get_environment(
+            context, extensions_context=render_context, keep_trailing_newline=True
+        )
         template = env.from_string(contents)
         output = template.render(**render_context)
 
@@ -14,6 +14,7 @@ from tackle.parser.settings import get_settings
 from tackle.models import Context, Mode, Output, Source
 from tackle.repository import update_source
 from tackle.parser import update_context
+from tackle.session import Session
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,9 @@ def tackle(
     replay=None,
     record=None,
     rerun=None,
+    incremental=None,
+    checkpoint=None,
+    resume=None,
     output_dir='.',
     overwrite_if_exists=False,
     skip_if_file_exists=False,
@@ -42,6 +46,12 @@ def tackle(
     config=None,
     calling_directory=None,
     providers=None,
+    template_cache=None,
+    env_registry=None,
+    hook_workers=None,
+    fingerprints=None,
+    journal=None,
+    session=None,
 ):
     """
     Run Tackle Box just as if using it from the command line.
@@ -63,23 +73,60 @@ def tackle(
     :param replay: Do not prompt for input, instead read from saved json. If
         ``True`` read from the ``replay_dir``.
         if it exists
+    :param incremental: Reuse the outputs of the hooks whose input and the keys
+        they reference are unchanged since the last run. If ``True`` they are
+        recorded in ``.<template name>.incremental.pickle`` in the calling
+        directory, otherwise in the file at this path.
+    :param checkpoint: Journal the output of each key as it completes. If ``True``
+        the journal is ``.<template name>.checkpoint.pickle`` in the calling
+        directory, otherwise the file at this path. It is removed once the run
+        completes.
+    :param resume: Restore the keys completed by the failed run from the
+        checkpoint journal and continue from the key that failed.
     :param output_dir: Where to output the generated project dir into.
     :param password: The password to use when extracting the repository.
     :param directory: Relative path to a cookiecutter template in a repository.
     :param accept_hooks: Accept pre and post hooks if set to `True`.
     :param config_file: User configuration file path.
     :param default_config: Use default values rather than a config file.
+    :param template_cache: A `TemplateCache` to share compiled templates with,
+        ie from a calling tackle run. Defaults to a new cache for this run.
+    :param env_registry: An `EnvironmentRegistry` to share Jinja environments
+        with. Defaults to a new registry for this run.
+    :param hook_workers: Number of threads to run hooks that don't depend on each
+        other with. Defaults to running all the keys in order.
+    :param fingerprints: The `Fingerprints` of an incremental calling tackle run
+        to record the keys of this run in.
+    :param journal: The checkpoint `Journal` of a calling tackle run to journal
+        the keys of this run in.
+    :param session: A `Session` to run within, ie the one of a calling tackle
+        run, whose settings are used instead of the config arguments along with
+        its providers and caches. Defaults to a new session for this run.
 
     :return Dictionary of output
     """
-    settings = get_settings(
-        config_file=config_file,
-        env_file=env_file,
-        config=config,
-        default_config=default_config,
-    )
+    if session is None:
+        session = Session(
+            settings=get_settings(
+                config_file=config_file,
+                env_file=env_file,
+                config=config,
+                default_config=default_config,
+            ),
+            template_cache=template_cache,
+            env_registry=env_registry,
+        )
+    settings = session.settings
 
-    mode = Mode(no_input=no_input, replay=replay, record=record, rerun=rerun)
+    mode = Mode(
+        no_input=no_input,
+        replay=replay,
+        record=record,
+        rerun=rerun,
+        incremental=incremental,
+        checkpoint=checkpoint,
+        resume=resume,
+    )
 
     source = Source(
         template=template,
@@ -89,7 +136,7 @@ def tackle(
         password=password,
         directory=directory,
     )
-    update_source(source=source, settings=settings, mode=mode)
+    update_source(source=source, settings=settings, mode=mode, clones=session.clones)
 
     context = Context(
         # context_file=context_file,
@@ -99,6 +146,13 @@ def tackle(
         context_key=context_key,
         tackle_gen=source.tackle_gen,
         calling_directory=calling_directory,
+        template_cache=session.template_cache,
+        env_registry=session.env_registry,
+        hook_workers=hook_workers,
+        fingerprints=fingerprints,
+        journal=journal,
+        hook_cache=session.hook_cache,
+        session=session,
     )
     update_context(
         context=context,
@@ -116,6 +170,8 @@ def tackle(
     )
     generate_files(output=output, context=context, source=source)
 
+    logger.debug("Template cache %s", context.template_cache.info())
+
     # Cleanup (if required)
     if source.cleanup:
         rmtree(source.repo_dir)
@@ -1,13 +1,22 @@
 """Models for the whole project."""
+import asyncio
+import hashlib
+import json
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import os
 from enum import Enum
+from functools import lru_cache
 
-from pydantic import BaseModel, SecretStr, BaseSettings, Extra
-from typing import Dict, Any, Union, Type, List, Optional
+from pydantic import BaseModel, SecretStr, BaseSettings, Extra, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import ExtraError, MissingError
+from typing import Dict, Any, Union, Type, List, Optional, ClassVar
+from typing_extensions import Literal
 
 from tackle.render.environment import StrictEnvironment
 from tackle.utils.paths import expand_path
+from tackle.utils import run_in_thread
 from tackle.utils.context_manager import work_in
 
 USER_CONFIG_PATH = os.path.expanduser('~/.tacklerc')
@@ -18,14 +27,29 @@ DEFAULT_ABBREVIATIONS: Dict = {
     'bb': 'https://bitbucket.org/{0}',
 }
 
+# Hook classes by their `type`, filled in as the hooks are defined
+HOOK_REGISTRY: Dict[str, Type['BaseHook']] = {}
+
 
 class Settings(BaseSettings):
     """Base settings for run."""
 
     tackle_dir: str = '~/.tackle'
     replay_dir: str = os.path.join(tackle_dir, 'replay')
+    # Compiled plans of context files, see `tackle.parser.plan`. Set to empty to
+    # not cache them on disk.
+    plans_dir: str = os.path.join(tackle_dir, 'plans')
+    # Hook types defined in each provider, see `tackle.parser.providers`. Set to
+    # empty to scan the providers on each run.
+    providers_manifest: str = os.path.join(tackle_dir, 'providers.json')
+    # Results of hooks run with `cache`, see `tackle.utils.hook_cache`. Set to
+    # empty to not cache them.
+    hook_cache_dir: str = os.path.join(tackle_dir, 'cache')
+    hook_cache_size: int = 100 * 1024 * 1024
 
     rerun_file_suffix: str = 'rerun.yml'
+    incremental_file_suffix: str = 'incremental.pickle'
+    checkpoint_file_suffix: str = 'checkpoint.pickle'
 
     abbreviations: Dict = {}
     default_context: Dict = OrderedDict([])
@@ -45,6 +69,12 @@ class Settings(BaseSettings):
 
         self.tackle_dir = expand_path(self.tackle_dir)
         self.replay_dir = expand_path(self.replay_dir)
+        if self.plans_dir:
+            self.plans_dir = expand_path(self.plans_dir)
+        if self.providers_manifest:
+            self.providers_manifest = expand_path(self.providers_manifest)
+        if self.hook_cache_dir:
+            self.hook_cache_dir = expand_path(self.hook_cache_dir)
 
 
 class TackleGen(str, Enum):
@@ -61,6 +91,9 @@ class Mode(BaseModel):
     replay: Union[bool, str] = None
     record: Union[bool, str] = None
     rerun: Union[bool, str] = None
+    incremental: Union[bool, str] = None
+    checkpoint: Union[bool, str] = None
+    resume: bool = None
 
 
 class Source(BaseModel):
@@ -92,8 +125,11 @@ class Provider(BaseModel):
 
     path: str = None
     hooks_path: str = None
+    # Hook types of the provider, from its manifest
     hook_types: list = []
     hook_modules: list = []
+    # Files defining each hook type, imported on first use
+    hook_files: dict = {}
 
     name: str = None  # defaults to os.path.basename(path)
 
@@ -126,6 +162,75 @@ class Context(BaseModel):
     providers: List[Provider] = []
     imported_hook_types: List[str] = []
 
+    # Jinja environments and compiled templates shared by everything rendered
+    # within a run
+    env_registry: Any = None
+    template_cache: Any = None
+    # View of the output used to render, see `tackle.render.RenderContext`
+    render_context: Any = None
+    # Number of threads to run independent hooks with, see
+    # `tackle.parser.scheduler.HookScheduler`. Keys are run in order when not set.
+    hook_workers: int = None
+    # Store of the results of hooks with `cache`, see
+    # `tackle.utils.hook_cache.HookResultCache`
+    hook_cache: Any = None
+    # Fingerprints of the keys of the last run when run with `incremental`, see
+    # `tackle.parser.incremental.Fingerprints`
+    fingerprints: Any = None
+    # Journal of the completed keys when run with `checkpoint`, see
+    # `tackle.parser.checkpoint.Journal`
+    journal: Any = None
+    # Settings, providers and caches shared with nested runs, see
+    # `tackle.session.Session`
+    session: Any = None
+
+
+class HookCache(BaseModel):
+    """Options of the `cache` base method of hooks."""
+
+    # Seconds the result is valid for, forever if None
+    ttl: int = None
+    # Fields of the hook the result depends on, defaults to all of them
+    keys: List[str] = None
+    # Whether the result is shared by all directories or per working directory
+    scope: Literal['global', 'directory'] = 'global'
+    # Files whose contents the result depends on
+    files: List[str] = []
+
+
+class HookFields(object):
+    """The fields of a hook class split by where their values come from.
+
+    :param cls: The hook class, see `get_hook_fields`.
+    """
+
+    def __init__(self, cls: Type['BaseHook']):
+        shared = set(Context.__fields__) | set(Mode.__fields__)
+        own = [(k, v) for k, v in cls.__fields__.items() if k not in shared]
+        self.own = tuple(k for k, _ in own)
+        self.required = tuple(k for k, v in own if v.required)
+        self.defaults = tuple((k, v) for k, v in own if not v.required)
+        # Root validators need all the values
+        self.validates_fields = not (
+            cls.__pre_root_validators__ or cls.__post_root_validators__
+        )
+        # Validators can change values depending on more than their type
+        self.trusts_shapes = not any(v.class_validators for _, v in own)
+        # Keys and types of the hook dicts that validation returned as is
+        self.shapes = set()
+
+    def with_defaults(self, values: dict) -> dict:
+        """Return the values with the defaults of the fields not in them."""
+        fields = {k: v.get_default() for k, v in self.defaults if k not in values}
+        fields.update(values)
+        return fields
+
+
+@lru_cache(maxsize=None)
+def get_hook_fields(cls: Type['BaseHook']) -> HookFields:
+    """Return the fields of a hook class, computed once per class."""
+    return HookFields(cls)
+
 
 class BaseHook(Context, Mode):
     """Base hook mixin class."""
@@ -134,22 +239,203 @@ class BaseHook(Context, Mode):
     merge: Optional[bool] = False
     post_gen_hook: Optional[bool] = False
     confirm: Optional[str] = False
+    cache: Union[bool, HookCache] = None
+
+    # Whether the hook can run alongside other hooks, ie it doesn't prompt, change
+    # directories or write anything that other hooks could read.
+    parallel_safe: ClassVar[bool] = False
+    # Whether the output of the hook only depends on its input so that incremental
+    # runs can reuse it when the input is unchanged, ie it doesn't prompt, modify
+    # its input, write anything or read anything that isn't in its input.
+    reusable: ClassVar[bool] = False
 
     class Config:
         arbitrary_types_allowed = True
         extra = Extra.forbid
         # orm_mode = True
 
+    def __init__(
+        __pydantic_self__,
+        __context__: 'Context' = None,
+        __mode__: 'Mode' = None,
+        __trusted__: bool = False,
+        **data: Any,
+    ):
+        """Instantiate the hook, optionally within a context and mode.
+
+        Hooks are normally instantiated with the fields of the context and mode
+        which pydantic copies and validates each time. When the context and mode
+        are given instead, only the fields in `data`, ie the hook dict, are
+        validated and the rest are taken from the context and mode as is so the
+        cost doesn't grow with the size of the context.
+
+        :param __context__: Context to take the fields not in `data` from.
+        :param __mode__: Mode to take the fields not in `data` from.
+        :param __trusted__: Skip validating `data` if a hook dict with the same
+            keys and types of values was validated without being changed before,
+            ie for each run of a compiled hook, see `tackle.parser.plan`.
+        """
+        if __context__ is None and __mode__ is None:
+            return super().__init__(**data)
+
+        cls = __pydantic_self__.__class__
+        shared = {}
+        for i in (__context__, __mode__):
+            if i is not None:
+                shared.update(i.__dict__)
+        if not get_hook_fields(cls).validates_fields:
+            # Need all the values, validate them all
+            shared.update(data)
+            return super().__init__(**shared)
+
+        values = cls.validate_hook_dict(data, trusted=__trusted__)
+        fields_set = set(data) | set(shared)
+        shared.update(values)
+        object.__setattr__(__pydantic_self__, '__dict__', shared)
+        object.__setattr__(__pydantic_self__, '__fields_set__', fields_set)
+        __pydantic_self__._init_private_attributes()
+
+    @classmethod
+    def validate_hook_dict(cls, data: dict, trusted: bool = False) -> dict:
+        """Validate a hook dict and return it with the defaults of the hook.
+
+        Only the fields in the hook dict are validated, the fields of the hook
+        not in it get their defaults, ie the result has no context or mode.
+
+        :param trusted: Skip validating if a hook dict with the same keys and
+            types of values was validated without being changed before.
+        """
+        hook_fields = get_hook_fields(cls)
+        shape = None
+        if trusted and hook_fields.trusts_shapes:
+            shape = tuple((k, type(v)) for k, v in data.items())
+            if shape in hook_fields.shapes:
+                # Same as `construct`
+                return hook_fields.with_defaults(data)
+
+        values = {}
+        errors = []
+        unchanged = True
+        for name, value in data.items():
+            field = cls.__fields__.get(name)
+            if field is None:
+                errors.append(ErrorWrapper(ExtraError(), loc=name))
+                continue
+            validated, error = field.validate(value, values, loc=name, cls=cls)
+            if error:
+                errors.append(error)
+                continue
+            values[name] = validated
+            if unchanged and shape is not None:
+                # Ie containers are copied so they are never trusted
+                unchanged = validated is value
+        for name in hook_fields.required:
+            if name not in values and name not in data:
+                errors.append(ErrorWrapper(MissingError(), loc=name))
+        if errors:
+            raise ValidationError(errors, cls)
+
+        if shape is not None and unchanged:
+            hook_fields.shapes.add(shape)
+        return hook_fields.with_defaults(values)
+
+    def __init_subclass__(cls, **kwargs):
+        """Register the hook in `HOOK_REGISTRY` by the type it declares.
+
+        Only classes declaring a `type` themselves are registered so subclasses
+        of a hook, at any level, don't replace it unless they set their own type.
+        Hooks imported again, ie from a reloaded provider, replace the old class.
+        """
+        super().__init_subclass__(**kwargs)
+        field = cls.__fields__.get('type')
+        if field is None or 'type' not in cls.__dict__.get('__annotations__', {}):
+            return
+        if isinstance(field.default, str):
+            HOOK_REGISTRY[field.default] = cls
+
     def execute(self) -> Any:
-        """Abstract method."""
+        """Abstract method, hooks implementing `aexecute` instead are awaited.
+
+        When called from a running event loop, ie a coroutine of the scheduler,
+        the `aexecute` of the hook is run on its own loop in another thread.
+        """
+        if self.is_async():
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.aexecute())
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return executor.submit(asyncio.run, self.aexecute()).result()
         raise NotImplementedError()
 
-    def call(self) -> Any:
+    async def aexecute(self) -> Any:
+        """Async counterpart of `execute`, runs `execute` in a thread by default.
+
+        Hooks waiting on I/O can implement it instead of `execute` to be awaited
+        alongside other hooks, see `tackle.parser.scheduler.HookScheduler`.
         """
-        Call main entrypoint to calling hook.
+        return await run_in_thread(self.execute)
+
+    @classmethod
+    def is_async(cls) -> bool:
+        """Return whether the hook implements `aexecute`."""
+        return cls.aexecute is not BaseHook.aexecute
 
-        Handles `chdir` method.
+    @classmethod
+    def execute_batch(cls, items: List[dict]) -> List[Any]:
+        """Optional method running the hook once for all the items of a loop.
+
+        Hooks that don't depend on the context can implement it to run a loop in
+        a single call instead of being instantiated for each item.
+
+        :param items: The hook dicts of the items, validated and with the
+            defaults of the hook, see `validate_hook_dict`.
+        :return: The outputs of the items in order.
+        """
+        raise NotImplementedError()
+
+    @classmethod
+    def supports_batch(cls) -> bool:
+        """Return whether the hook implements `execute_batch`."""
+        return cls.execute_batch.__func__ is not BaseHook.execute_batch.__func__
+
+    def cache_key(self) -> str:
+        """Return the key of the result of the hook for `cache`.
+
+        The key is a hash of the type of the hook, the values of its fields, the
+        contents of the `files` and for `directory` scoped results the working
+        directory.
         """
+        options = self.cache if isinstance(self.cache, HookCache) else HookCache()
+        keys = options.keys
+        if keys is None:
+            keys = [i for i in get_hook_fields(self.__class__).own if i != 'cache']
+        files = {}
+        for i in options.files:
+            path = os.path.abspath(os.path.expanduser(i))
+            try:
+                with open(path, 'rb') as f:
+                    files[path] = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                files[path] = None
+        key = {
+            'type': self.type,
+            'fields': {i: getattr(self, i, None) for i in keys},
+            'files': files,
+            'directory': os.getcwd() if options.scope == 'directory' else None,
+        }
+        return hashlib.sha256(
+            json.dumps(key, sort_keys=True, default=repr).encode()
+        ).hexdigest()
+
+    def _cached(self):
+        """Return the key and ttl of the result if the hook is cached."""
+        if not self.cache or self.hook_cache is None:
+            return None, None
+        ttl = self.cache.ttl if isinstance(self.cache, HookCache) else None
+        return self.cache_key(), ttl
+
+    def _call(self) -> Any:
         if self.chdir and os.path.isdir(
             os.path.abspath(os.path.expanduser(self.chdir))
         ):
@@ -159,6 +445,37 @@ class BaseHook(Context, Mode):
         else:
             return self.execute()
 
+    def call(self) -> Any:
+        """
+        Call main entrypoint to calling hook.
+
+        Handles `chdir` and `cache` methods, cached results skip `execute`.
+        """
+        key, ttl = self._cached()
+        if key is None:
+            return self._call()
+        hit, value = self.hook_cache.get(key, ttl)
+        if hit:
+            return value
+        value = self._call()
+        self.hook_cache.set(key, value)
+        return value
+
+    async def acall(self) -> Any:
+        """Async counterpart of `call`."""
+        if self.chdir:
+            # Changing directories is process wide so is never awaited
+            return self.call()
+        key, ttl = self._cached()
+        if key is None:
+            return await self.aexecute()
+        hit, value = self.hook_cache.get(key, ttl)
+        if hit:
+            return value
+        value = await self.aexecute()
+        self.hook_cache.set(key, value)
+        return value
+
 
 class Output(BaseModel):
     """Output model."""
@@ -7,6 +7,8 @@ import logging
 from collections import OrderedDict
 
 from tackle.parser.context import prep_context
+from tackle.parser.checkpoint import Journal
+from tackle.parser.incremental import Fingerprints
 from tackle.utils.files import load, dump
 
 from tackle.exceptions import InvalidModeException
@@ -16,6 +18,7 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from tackle.models import Context, Mode, Source, Settings, Providers
+    from tackle.session import Session
 
 logger = logging.getLogger(__name__)
 
@@ -45,8 +48,11 @@ def _output_record(context: 'Context', mode: 'Mode', settings: 'Settings'):
             )
 
 
-def _evaluate_rerun(rerun_path, mode: 'Mode'):
+def _evaluate_rerun(rerun_path, mode: 'Mode', session: 'Session' = None):
     if os.path.exists(rerun_path):
+        if session is not None:
+            # Read once for the nested runs
+            return session.read_config_file(rerun_path, 'yaml')
         with open(rerun_path, 'r') as f:
             return yaml.safe_load(f)
     # else:
@@ -105,19 +111,60 @@ def update_context(
             #  unless the function call is aware of which context (the calling context)
             #  or a subprocess context. Detecting based on calling dir won't work.
             # if os.path.abspath(os.path.curdir) == context.calling_directory:
-            context.override_inputs = _evaluate_rerun(context.rerun_path, mode)
+            context.override_inputs = _evaluate_rerun(
+                context.rerun_path, mode, context.session
+            )
         if isinstance(mode.rerun, bool):
             context.rerun_path = os.path.join(
                 context.calling_directory,
                 '.' + '.'.join([source.template_name, settings.rerun_file_suffix]),
             )
-            context.override_inputs = _evaluate_rerun(context.rerun_path, mode)
+            context.override_inputs = _evaluate_rerun(
+                context.rerun_path, mode, context.session
+            )
+
+    fingerprints = None
+    if mode.incremental and context.fingerprints is None:
+        # Nested tackle runs record their keys in the fingerprints of the calling
+        # run which are written once it is done
+        if isinstance(mode.incremental, str):
+            incremental_path = mode.incremental
+        else:
+            file_name = '.'.join(
+                [source.template_name, settings.incremental_file_suffix]
+            )
+            incremental_path = os.path.join(context.calling_directory, '.' + file_name)
+        fingerprints = context.fingerprints = Fingerprints(incremental_path)
 
     context_file_path = os.path.join(source.repo_dir, source.context_file)
     logger.debug('context_file is %s', context_file_path)
 
+    journal = None
+    if (mode.checkpoint or mode.resume) and context.journal is None:
+        # Like the fingerprints, nested tackle runs use the journal of the calling run
+        if isinstance(mode.checkpoint, str):
+            checkpoint_path = mode.checkpoint
+        else:
+            file_name = '.'.join(
+                [source.template_name, settings.checkpoint_file_suffix]
+            )
+            checkpoint_path = os.path.join(context.calling_directory, '.' + file_name)
+        journal = context.journal = Journal(checkpoint_path, resume=mode.resume)
+
     # Main entrypoint to parse the input.
-    prep_context(context=context, mode=mode, source=source, settings=settings)
+    try:
+        prep_context(context=context, mode=mode, source=source, settings=settings)
+    except BaseException:
+        if journal is not None:
+            print(f"Writing checkpoint file to {journal.path}")
+            journal.close()
+        raise
+    else:
+        if journal is not None:
+            journal.close(completed=True)
+    finally:
+        if fingerprints is not None:
+            fingerprints.save()
 
     if mode.record:
         _output_record(context=context, mode=mode, settings=settings)
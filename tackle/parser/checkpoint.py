@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+"""Journal of the keys completed in a run to resume it after a failure."""
+import logging
+import os
+import pickle
+import threading
+
+from tackle.parser.incremental import Fingerprints
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from tackle.models import Context, Source
+
+logger = logging.getLogger(__name__)
+
+
+class Journal(object):
+    """Append only journal of the outputs of the keys completed in a run.
+
+    Each key is appended as a pickled `(key, fingerprint, output)` record as soon
+    as it is done, see `Fingerprints.fingerprint`, where the output holds the
+    values the key set in the output dict, ie none for the keys skipped by `when`
+    and the merged values for the keys with `merge`. When resuming, the journal of
+    the failed run is read and the keys of each context file are restored in
+    order up to the first one that isn't in it or whose input changed, ie the
+    key that failed, from which the run continues. The journal is written again
+    as the run goes and removed once the run is done.
+
+    Keys are recorded per context file so that nested tackle runs share the
+    journal of the run calling them.
+
+    :param path: File the journal is written to.
+    :param resume: Restore the keys from the journal at the path.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self.completed = {}
+        # Fingerprints of the keys being parsed
+        self.pending = {}
+        # Output before the keys with `merge` being parsed
+        self.before_merge = {}
+        # Context files with a key that wasn't restored
+        self.stopped = set()
+        self.lock = threading.Lock()
+        if resume and os.path.isfile(path):
+            self.completed = dict(self._read(path))
+            logger.debug(f"Resuming {len(self.completed)} keys from {path}")
+        self.file = open(path, 'wb')
+
+    @staticmethod
+    def _read(path: str):
+        """Yield the records of a journal, up to a truncated one."""
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    key, fingerprint, output = pickle.load(f)
+                except EOFError:
+                    return
+                except Exception as e:
+                    # ie the run was killed while writing
+                    logger.debug(f"Unable to read the journal in {path} - {e}")
+                    return
+                yield key, (fingerprint, output)
+
+    @staticmethod
+    def _key(context: 'Context', source: 'Source', key: str) -> tuple:
+        return source.repo_dir, source.context_file, context.context_key, key
+
+    def restore(self, context: 'Context', source: 'Source', key: str, raw: Any) -> bool:
+        """Set the journaled output of a key if it is part of the completed keys."""
+        journal_key = self._key(context, source, key)
+        fingerprint = Fingerprints.fingerprint(context, raw)
+        with self.lock:
+            self.pending[journal_key] = fingerprint
+            if isinstance(raw, dict) and 'merge' in raw:
+                self.before_merge[journal_key] = dict(context.output_dict)
+            if journal_key[:-1] in self.stopped:
+                return False
+            completed = self.completed.pop(journal_key, None)
+            if completed is None or completed[0] != fingerprint:
+                self.stopped.add(journal_key[:-1])
+                return False
+        logger.debug(f"Resuming the output of key='{key}'.")
+        context.output_dict.update(completed[1])
+        self.record(context, source, key)
+        return True
+
+    def record(self, context: 'Context', source: 'Source', key: str):
+        """Append the output of a completed key to the journal."""
+        journal_key = self._key(context, source, key)
+        with self.lock:
+            fingerprint = self.pending.pop(journal_key, None)
+            before = self.before_merge.pop(journal_key, None)
+        if fingerprint is None:
+            return
+        if before is not None:
+            # The values merged into the output, or the output of the key if its
+            # `merge` was false
+            output = {
+                k: v
+                for k, v in context.output_dict.items()
+                if k not in before or before[k] is not v
+            }
+        elif key in context.output_dict:
+            output = {key: context.output_dict[key]}
+        else:
+            output = {}
+        try:
+            data = pickle.dumps((journal_key, fingerprint, output))
+        except Exception as e:
+            logger.debug(f"Unable to journal the output of key='{key}' - {e}")
+            return
+        with self.lock:
+            self.file.write(data)
+            self.file.flush()
+
+    def close(self, completed: bool = False):
+        """Close the journal, removing it if the run completed."""
+        self.file.close()
+        if completed:
+            os.remove(self.path)
@@ -5,14 +5,18 @@ import os
 import logging
 import yaml
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from jinja2.exceptions import UndefinedError
 from tackle.render import render_variable
 from tackle.utils.context_manager import work_in
 from tackle.utils.reader import read_config_file, apply_overwrites_to_inputs
 from tackle.exceptions import UndefinedVariableInTemplate, UnknownHookTypeException
 from tackle.parser.prompts import prompt_list, prompt_str, read_user_dict
-from tackle.parser.hooks import parse_hook
+from tackle.parser.hooks import parse_hook, aparse_hook
+from tackle.parser.plan import load_plan
 from tackle.parser.providers import get_providers
+from tackle.parser.scheduler import HookScheduler
 
 from typing import TYPE_CHECKING
 
@@ -32,9 +36,109 @@ def dump_rerun_on_error(context: 'Context', mode: 'Mode'):
             yaml.dump(dict(context.output_dict), f)
 
 
+@contextmanager
+def parse_errors(context: 'Context', mode: 'Mode'):
+    """Raise errors from parsing the current key with the key in the message."""
+    try:
+        yield
+    except UndefinedError as err:
+        dump_rerun_on_error(context, mode)
+        msg = "Unable to render variable '{}'".format(context.key)
+        raise UndefinedVariableInTemplate(msg, err, context.input_dict)
+    except UnknownHookTypeException as err:
+        dump_rerun_on_error(context, mode)
+        raise UnknownHookTypeException(err)
+
+
+def parse_key(context: 'Context', mode: 'Mode', source: 'Source', key: str, raw):
+    """Parse a single key of the input context into the output dict."""
+    context.key = key
+    # context.raw = raw
+    # if context.key in context.override_inputs:
+    #     # If there is a rerun dictionary then insert it in output and proceed.
+    #     context.output_dict[key] = context.override_inputs[key]
+    #     return
+    if key.startswith(u'_') and not key.startswith('__'):
+        # Single underscore denotes unrendered value
+        context.output_dict[key] = raw
+        return
+    elif key.startswith('__'):
+        # Double underscore denotes rendered value
+        context.output_dict[key] = render_variable(context, raw)
+        return
+
+    if context.overwrite_inputs:
+        if key in context.overwrite_inputs:
+            context.output_dict[key] = context.overwrite_inputs[key]
+            return
+
+    if context.journal is not None:
+        if context.journal.restore(context, source, key, raw):
+            return
+
+    with parse_errors(context, mode):
+        if isinstance(raw, bool):
+            # Simply set the variable - perhaps later make this a choice
+            context.output_dict[key] = raw
+        if isinstance(raw, list):
+            # We are dealing with a choice variable
+            context.output_dict[key] = prompt_list(context, mode, raw)
+        elif isinstance(raw, str):
+            # We are dealing with a regular variable
+            context.output_dict[key] = prompt_str(context, mode, raw)
+
+        elif isinstance(raw, dict):
+            # dict parsing logic
+            if 'type' not in raw:
+                val = render_variable(context, raw)
+                if not mode.no_input:
+                    val = read_user_dict(key, val)
+                context.output_dict[key] = val
+            else:
+                fingerprints = context.fingerprints
+                if fingerprints is None or not fingerprints.restore(
+                    context, source, key, raw
+                ):
+                    # Main entrypoint into hook parsing logic
+                    parse_hook(context, mode, source)
+                    if fingerprints is not None:
+                        fingerprints.record(context, source, key)
+
+    if context.journal is not None:
+        context.journal.record(context, source, key)
+
+
+async def aparse_key(
+    context: 'Context',
+    mode: 'Mode',
+    source: 'Source',
+    key: str,
+    executor: ThreadPoolExecutor = None,
+):
+    """Async counterpart of `parse_key` for keys that are hooks."""
+    context.key = key
+    raw = context.input_dict[context.context_key][key]
+    if context.journal is not None:
+        if context.journal.restore(context, source, key, raw):
+            return
+
+    with parse_errors(context, mode):
+        fingerprints = context.fingerprints
+        if fingerprints is None or not fingerprints.restore(context, source, key, raw):
+            await aparse_hook(context, mode, source, executor=executor)
+            if fingerprints is not None:
+                fingerprints.record(context, source, key)
+
+    if context.journal is not None:
+        context.journal.record(context, source, key)
+
+
 def parse_context(context: 'Context', mode: 'Mode', source: 'Source'):
     """Parse the context and iterate over values.
 
+    When `hook_workers` is set, keys are handed to a `HookScheduler` which runs
+    the hooks that don't depend on each other concurrently.
+
     :param dict context: Source for field names and sample values.
     :param env: Jinja environment to render values with.
     :param context_key: The key to insert all the outputs under in the context dict.
@@ -42,56 +146,12 @@ def parse_context(context: 'Context', mode: 'Mode', source: 'Source'):
     :param existing_context: A dictionary of values to use during rendering.
     :return: cc_dict
     """
-    for key, raw in context.input_dict[context.context_key].items():
-        context.key = key
-        # context.raw = raw
-        # if context.key in context.override_inputs:
-        #     # If there is a rerun dictionary then insert it in output and proceed.
-        #     context.output_dict[key] = context.override_inputs[key]
-        #     continue
-        if key.startswith(u'_') and not key.startswith('__'):
-            # Single underscore denotes unrendered value
-            context.output_dict[key] = raw
-            continue
-        elif key.startswith('__'):
-            # Double underscore denotes rendered value
-            context.output_dict[key] = render_variable(context, raw)
-            continue
-
-        if context.overwrite_inputs:
-            if key in context.overwrite_inputs:
-                context.output_dict[key] = context.overwrite_inputs[key]
-                continue
-
-        try:
-            if isinstance(raw, bool):
-                # Simply set the variable - perhaps later make this a choice
-                context.output_dict[key] = raw
-            if isinstance(raw, list):
-                # We are dealing with a choice variable
-                context.output_dict[key] = prompt_list(context, mode, raw)
-            elif isinstance(raw, str):
-                # We are dealing with a regular variable
-                context.output_dict[key] = prompt_str(context, mode, raw)
-
-            elif isinstance(raw, dict):
-                # dict parsing logic
-                if 'type' not in raw:
-                    val = render_variable(context, raw)
-                    if not mode.no_input:
-                        val = read_user_dict(key, val)
-                    context.output_dict[key] = val
-                else:
-                    # Main entrypoint into hook parsing logic
-                    parse_hook(context, mode, source)
+    if context.hook_workers:
+        HookScheduler(context, mode, source, parse_key, aparse_key).run()
+        return context
 
-        except UndefinedError as err:
-            dump_rerun_on_error(context, mode)
-            msg = "Unable to render variable '{}'".format(key)
-            raise UndefinedVariableInTemplate(msg, err, context.input_dict)
-        except UnknownHookTypeException as err:
-            dump_rerun_on_error(context, mode)
-            raise UnknownHookTypeException(err)
+    for key, raw in context.input_dict[context.context_key].items():
+        parse_key(context, mode, source, key, raw)
 
     return context
 
@@ -102,7 +162,11 @@ def prep_context(
 ):
     """Prepare the context by setting some default values."""
     # Read config
-    obj = read_config_file(os.path.join(source.repo_dir, source.context_file))
+    context_file_path = os.path.join(source.repo_dir, source.context_file)
+    if context.session is not None:
+        obj = context.session.read_config_file(context_file_path)
+    else:
+        obj = read_config_file(context_file_path)
 
     # Add the Python object to the context dictionary
     if not context.context_key:
@@ -143,5 +207,8 @@ def prep_context(
     # Entrypoint into providers.py
     get_providers(context, source, settings, mode)
 
+    # Compile the hooks and templates ahead of parsing
+    load_plan(context, settings, context_file_path)
+
     with work_in(context.input_dict[context.context_key]['_template']):
         return parse_context(context, mode, source)
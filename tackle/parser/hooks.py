@@ -6,12 +6,19 @@ import logging
 from PyInquirer import prompt
 from pydantic.error_wrappers import ValidationError
 
-from tackle.render import render_variable
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from tackle.render import render_variable, contains_template, copy_node, is_template
+from tackle.parser.plan import HookNode, compile_hook
 from tackle.parser.providers import get_hook
 from tackle.exceptions import HookCallException
-from tackle.models import BaseHook
+from tackle.models import BaseHook, get_hook_fields
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Sized, Type
 
 if TYPE_CHECKING:
     from tackle.models import Mode, Context, Source
@@ -47,44 +54,53 @@ def raise_hook_validation_error(e, Hook, context: 'Context', source: 'Source'):
         raise e
 
 
-def run_hook(context: 'Context', mode: 'Mode', source: 'Source'):
-    """Run hook."""
+def build_hook(
+    context: 'Context', mode: 'Mode', source: 'Source', trusted: bool = False
+) -> BaseHook:
+    """Instantiate the hook from the hook dict.
+
+    :param trusted: Skip validating hook dicts shaped like ones validated before,
+        see `BaseHook.__init__`.
+    """
     if context.input_dict is None:
         context.input_dict = {}
 
     Hook = get_hook(context.hook_dict['type'], context)
 
     try:
-        # Take the items out of the global context and mode if they are
-        # declared in the hook dict.
-        exclude_context = {
-            i for i in context.dict().keys() if i in context.hook_dict.keys()
-        }
-        exclude_context.update({'env'})
-        exclude_mode = {i for i in mode.dict().keys() if i in context.hook_dict.keys()}
-        exclude_mode = exclude_mode if exclude_mode != set() else {'tmp'}
-
-        hook = Hook(
+        # The hook takes the items of the global context and mode that aren't
+        # declared in the hook dict by reference, see `BaseHook.__init__`.
+        return Hook(
+            __context__=context,
+            __mode__=mode,
+            __trusted__=trusted,
             **context.hook_dict,
-            **context.dict(exclude=exclude_context),
-            **mode.dict(exclude=exclude_mode),
         )
 
-        # import json
-        # h = json.loads(hook.schema_json())
-        # d = hook.__doc__
-        # from docs.scratch import doc_formatter
-        # doc_formatter(h)
-
-        if hook.post_gen_hook:
-            return None, hook
-        else:
-            return hook.call(), None
-
     except ValidationError as e:
         raise_hook_validation_error(e, Hook, context, source=source)
 
 
+def run_hook(context: 'Context', mode: 'Mode', source: 'Source', trusted: bool = False):
+    """Run hook."""
+    hook = build_hook(context, mode, source, trusted=trusted)
+    if hook.post_gen_hook:
+        return None, hook
+    else:
+        return hook.call(), None
+
+
+async def arun_hook(
+    context: 'Context', mode: 'Mode', source: 'Source', trusted: bool = False
+):
+    """Await the hook, the async counterpart of `run_hook`."""
+    hook = build_hook(context, mode, source, trusted=trusted)
+    if hook.post_gen_hook:
+        return None, hook
+    else:
+        return await hook.acall(), None
+
+
 def _evaluate_confirm(context: 'Context'):
     if 'confirm' in context.hook_dict:
         if isinstance(context.hook_dict['confirm'], str):
@@ -135,118 +151,421 @@ def evaluate_when(hook_dict: dict, context: 'Context'):
             if not when_condition:
                 break
 
-    hook_dict.pop('when')
-
     return when_condition
 
 
-def evaluate_loop(context: 'Context', mode: 'Mode', source: 'Source'):
-    """Run the parse_hook function in a loop and return a list of outputs."""
-    loop_targets = render_variable(context, context.hook_dict['loop'])
-    context.hook_dict.pop('loop')
+def isolate_context(context: 'Context', **update) -> 'Context':
+    """Return a copy of the context with its own output for a hook to run in.
+
+    :param update: Fields to set on the copy.
+    """
+    fields = {
+        'output_dict': OrderedDict(context.output_dict),
+        'post_gen_hooks': [],
+        'render_context': None,
+        'hook_dict': None,
+    }
+    fields.update(update)
+    return context.copy(update=fields)
 
-    if len(loop_targets) == 0:
+
+LOOP_OPTION_KINDS = {bool: 'boolean', int: 'integer', str: 'string'}
+
+
+def _render_loop_option(
+    context: 'Context', node: HookNode, name: str, kind: type, default
+):
+    """Render an option of the loop and check its type."""
+    if name not in node.controls:
+        return default
+    value = render_variable(context, node.controls[name])
+    if not isinstance(value, kind):
+        raise HookCallException(
+            f"Parameter `{name}` should be {LOOP_OPTION_KINDS[kind]}."
+        )
+    return value
+
+
+def _iter_chunks(loop_items: Iterable, chunk_size: Optional[int]) -> Iterator[list]:
+    """Split the items of a loop into lists of `chunk_size`, one list if None."""
+    loop_items = iter(loop_items)
+    while True:
+        chunk = list(islice(loop_items, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+        if chunk_size is None:
+            return
+
+
+class LoopSink(object):
+    """Collect the outputs of the items of a loop.
+
+    The outputs are kept in a list unless a `path` is given in which case they
+    are written to it as JSON lines so the outputs of a long loop aren't kept in
+    memory.
+
+    :param path: Path to the JSON lines file to write the outputs to.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.outputs = []
+        self.file = None
+        if path:
+            self.file = open(os.path.expanduser(path), 'w')
+
+    def extend(self, outputs: list):
+        """Add the outputs of some items in order."""
+        if self.file is None:
+            self.outputs.extend(outputs)
+            return
+        for i in outputs:
+            self.file.write(json.dumps(i, default=str) + '\n')
+
+    def close(self):
+        """Close the file if any and return the output of the loop, can be repeated."""
+        if self.file is None:
+            return self.outputs
+        if not self.file.closed:
+            self.file.close()
+        return self.path
+
+
+def _parse_loop_item(
+    context: 'Context',
+    mode: 'Mode',
+    source: 'Source',
+    node: HookNode,
+    index: int,
+    item: Any,
+):
+    """Run an item of a loop in an isolated copy of the context."""
+    context.output_dict.update({'index': index, 'item': item})
+    output = run_node(context, mode, source, node, append_key=True)
+    return output, context.post_gen_hooks
+
+
+def evaluate_parallel_loop(
+    context: 'Context',
+    mode: 'Mode',
+    source: 'Source',
+    node: HookNode,
+    loop_items: list,
+    workers: int,
+    fail_fast: bool,
+    errors: list = None,
+):
+    """Run the items of a loop on a thread pool and return outputs in order.
+
+    Each item is parsed in its own copy of the context so `item` and `index`
+    don't leak between items. With `fail_fast` the first error is raised and the
+    items that haven't started are cancelled, otherwise all the items are run
+    and the errors are raised together.
+
+    :param errors: List to add the errors to instead of raising them, ie to run
+        the rest of the chunks of a loop before raising.
+    """
+    loop_output = []
+    raise_errors = errors is None
+    errors = [] if errors is None else errors
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _parse_loop_item, isolate_context(context), mode, source, node, i, l
+            )
+            for i, l in loop_items
+        ]
+        for (i, _), future in zip(loop_items, futures):
+            try:
+                output, post_gen_hooks = future.result()
+            except Exception as e:
+                if fail_fast:
+                    for f in futures:
+                        f.cancel()
+                    raise
+                errors.append(f"index={i}: {e}")
+                continue
+            loop_output.append(output)
+            context.post_gen_hooks.extend(post_gen_hooks)
+
+    if errors and raise_errors:
+        raise_loop_errors(context, errors)
+    return loop_output
+
+
+def raise_loop_errors(context: 'Context', errors: list):
+    """Raise the errors of the items of a loop together."""
+    raise HookCallException(
+        f"Error in {len(errors)} items of the loop in key='{context.key}' -> "
+        + ', '.join(errors)
+    )
+
+
+def get_batch_hook(context: 'Context', node: HookNode) -> Optional[Type[BaseHook]]:
+    """Return the hook class of a node if its loop can run in a single call.
+
+    The hook needs to implement `execute_batch` and the node can't use any of the
+    base methods that act on the context, ie `merge` or `chdir`, or that are
+    applied per item, ie `cache`.
+    """
+    if node.is_block or not isinstance(node.hook_type, str):
+        return None
+    if is_template(node.hook_type):
+        return None
+    if any(
+        i in node.fields
+        for i in ('chdir', 'merge', 'post_gen_hook', 'confirm', 'cache')
+    ):
+        return None
+    Hook = get_hook(node.hook_type, context)
+    if not Hook.supports_batch() or not get_hook_fields(Hook).validates_fields:
+        return None
+    return Hook
+
+
+def evaluate_batch(
+    context: 'Context',
+    source: 'Source',
+    node: HookNode,
+    Hook: Type[BaseHook],
+    loop_items: list,
+) -> list:
+    """Render the items of a loop then run them all in a single call."""
+    items = []
+    for i, l in loop_items:
+        context.output_dict.update({'index': i, 'item': l})
+        render_node(context, node)
+        try:
+            items.append(Hook.validate_hook_dict(context.hook_dict, trusted=True))
+        except ValidationError as e:
+            raise_hook_validation_error(e, Hook, context, source=source)
+    return Hook.execute_batch(items)
+
+
+def evaluate_loop(context: 'Context', mode: 'Mode', source: 'Source', node: HookNode):
+    """Run the hook of a node in a loop and return a list of outputs.
+
+    The loop can be over any iterable, ie a generator from another hook, which
+    is only consumed as the items are run unless the loop is reversed. The key
+    of such a generator is then removed from the output.
+
+    With `loop_workers` the items are run concurrently, see
+    `evaluate_parallel_loop`, otherwise hooks implementing `execute_batch` run all
+    the items at once. With `loop_chunk_size` the items are taken from the loop
+    and run that many at a time.
+
+    With `loop_sink`, the outputs are written to that file as JSON lines instead
+    and the output of the key is the path to it.
+    """
+    loop_targets = render_variable(context, node.controls['loop'])
+
+    if isinstance(loop_targets, Sized) and len(loop_targets) == 0:
         context.output_dict[context.key] = []
         return []
 
-    reverse = False
-    if 'reverse' in context.hook_dict:
-        # Handle reverse boolean logic
-        reverse = render_variable(context, context.hook_dict['reverse'])
-        if not isinstance(reverse, bool):
-            raise HookCallException("Parameter `reverse` should be boolean.")
-        context.hook_dict.pop('reverse')
+    # Handle reverse boolean logic
+    reverse = _render_loop_option(context, node, 'reverse', bool, False)
+    workers = _render_loop_option(context, node, 'loop_workers', int, None)
+    fail_fast = _render_loop_option(context, node, 'fail_fast', bool, True)
+    chunk_size = _render_loop_option(context, node, 'loop_chunk_size', int, None)
+    sink_path = _render_loop_option(context, node, 'loop_sink', str, None)
 
-    loop_output = []
-    for i, l in (
+    loop_items = (
         enumerate(loop_targets)
         if not reverse
         else reversed(list(enumerate(loop_targets)))
-    ):
-        # Create temporary variables in the context to be used in the loop.
-        context.output_dict.update({'index': i, 'item': l})
-        loop_output += [parse_hook(context, mode, source, append_key=True)]
+    )
+
+    if workers:
+        for i in ('chdir', 'merge'):
+            # These change the process / output that the items share
+            if i in node.fields:
+                raise HookCallException(
+                    f"Parameter `loop_workers` can't be used with `{i}`."
+                )
+
+    Hook = None if workers else get_batch_hook(context, node)
+    sink = LoopSink(sink_path)
+    try:
+        if workers:
+            errors = []
+            for chunk in _iter_chunks(loop_items, chunk_size):
+                sink.extend(
+                    evaluate_parallel_loop(
+                        context, mode, source, node, chunk, workers, fail_fast, errors
+                    )
+                )
+            if errors:
+                raise_loop_errors(context, errors)
+        elif Hook is not None:
+            for chunk in _iter_chunks(loop_items, chunk_size):
+                sink.extend(evaluate_batch(context, source, node, Hook, chunk))
+        else:
+            for i, l in loop_items:
+                # Create temporary variables in the context to be used in the loop.
+                context.output_dict.update({'index': i, 'item': l})
+                sink.extend([run_node(context, mode, source, node, append_key=True)])
+    finally:
+        loop_output = sink.close()
+        if isinstance(loop_targets, Iterator):
+            # A lazy output of an earlier key, see `is_loop_target`, is used up
+            # and can't be recorded
+            for k in [k for k, v in context.output_dict.items() if v is loop_targets]:
+                context.output_dict.pop(k)
 
     # Remove temp variables
-    context.output_dict.pop('item')
-    context.output_dict.pop('index')
+    context.output_dict.pop('item', None)
+    context.output_dict.pop('index', None)
     context.output_dict[context.key] = loop_output
     return context.output_dict
 
 
-def parse_hook(
+def render_node(context: 'Context', node: HookNode):
+    """Set the hook dict of the context to the rendered fields of the node."""
+    # Block hooks are run independently. This prevents rest of the hook dict from
+    # being rendered,
+    if node.is_block:
+        context.hook_dict = node.fields
+    elif node.templated:
+        context.hook_dict = render_variable(context, node.fields)
+    else:
+        context.hook_dict = copy_node(node.fields)
+
+
+def run_node(
     context: 'Context',
     mode: 'Mode',
     source: 'Source',
+    node: HookNode,
     append_key: bool = False,
 ):
-    """Parse input dict for loop and when logic and calls hooks.
+    """Render the fields of the node and run its hook.
 
-    :return: cc_dict
+    Hooks of compiled nodes are trusted, ie once a rendered hook dict of a given
+    shape passed validation unchanged, the next ones are not validated again.
     """
-    logger.debug(
-        "Parsing context_key: %s and key: %s" % (context.context_key, context.key)
-    )
-    context.hook_dict = context.input_dict[context.context_key][context.key]
+    render_node(context, node)
+
+    # Run the hook
+    if context.hook_dict['merge'] if 'merge' in context.hook_dict else False:
+        # Merging is for dict outputs only where the entire dict is inserted into the
+        # output dictionary.
+        to_merge, post_gen_hook = run_hook(context, mode, source, trusted=True)
+        if not isinstance(to_merge, dict):
+            # TODO: Raise better error with context
+            raise ValueError(
+                f"Error merging output from key='{context.key}' in "
+                f"file='{source.context_file}'."
+            )
+        context.output_dict.update(to_merge)
+    else:
+        # Normal hook run
+        context.output_dict[context.key], post_gen_hook = run_hook(
+            context, mode, source, trusted=True
+        )
+    if post_gen_hook:
+        # TODO: Update this per #4 hook-integration
+        context.post_gen_hooks.append(post_gen_hook)
+
+    if append_key:
+        return context.output_dict[context.key]
+    return context.output_dict
+
 
+def parse_node(
+    context: 'Context',
+    mode: 'Mode',
+    source: 'Source',
+    node: HookNode,
+    append_key: bool = False,
+):
+    """Evaluate the `else`, `when` and `loop` of a node and run its hook."""
     else_object = None
-    if 'else' in context.hook_dict:
-        else_object = render_variable(context, context.hook_dict['else'])
-        context.hook_dict.pop('else')
+    if 'else' in node.controls:
+        else_object = render_variable(context, node.controls['else'])
 
-    if evaluate_when(context.hook_dict, context):
+    if evaluate_when(node.controls, context):
         # Extract loop
-        if 'loop' in context.hook_dict:
-            # This runs the current function in a loop and returns a list of results
-            return evaluate_loop(context=context, mode=mode, source=source)
-
-        # Block hooks are run independently. This prevents rest of the hook dict from
-        # being rendered,
-        if 'block' not in context.hook_dict['type']:
-            context.hook_dict = render_variable(context, context.hook_dict)
-
-        # Run the hook
-        if context.hook_dict['merge'] if 'merge' in context.hook_dict else False:
-            # Merging is for dict outputs only where the entire dict is inserted into the
-            # output dictionary.
-            to_merge, post_gen_hook = run_hook(context, mode, source)
-            if not isinstance(to_merge, dict):
-                # TODO: Raise better error with context
-                raise ValueError(
-                    f"Error merging output from key='{context.key}' in "
-                    f"file='{source.context_file}'."
-                )
-            context.output_dict.update(to_merge)
-        else:
-            # Normal hook run
-            context.output_dict[context.key], post_gen_hook = run_hook(
-                context, mode, source
-            )
-        if post_gen_hook:
-            # TODO: Update this per #4 hook-integration
-            context.post_gen_hooks.append(post_gen_hook)
+        if 'loop' in node.controls:
+            # This runs the hook in a loop and returns a list of results
+            return evaluate_loop(context, mode, source, node)
 
-        if append_key:
-            return context.output_dict[context.key]
+        return run_node(context, mode, source, node, append_key=append_key)
 
     else:
         if else_object is not None:
             # Handle the false when condition if there is an `else` param.
-            # if 'else' in context.hook_dict:
             if isinstance(else_object, dict):
                 # If it is a dict, run it as another hook if type key exists, otherwise
                 # fallback to dict
                 if 'type' in else_object:
-                    context.input_dict[context.context_key][context.key] = else_object
-                    return parse_hook(context, mode, source, append_key=append_key)
+                    else_node = compile_hook(context, else_object)
+                    return parse_node(
+                        context, mode, source, else_node, append_key=append_key
+                    )
             else:
                 # If list or str return tha actual value
                 context.output_dict[context.key] = render_variable(context, else_object)
                 return context.output_dict
 
-    # if 'callback' in context.hook_dict:
-    #     # Call a hook var but don't return it's output
-    #     context.input_dict[context.context_key][context.key] = context.hook_dict['callback']
-    #     return parse_hook(context, mode, source, append_key=append_key)
+    return context.output_dict
+
+
+def parse_hook(
+    context: 'Context',
+    mode: 'Mode',
+    source: 'Source',
+    append_key: bool = False,
+):
+    """Parse input dict for loop and when logic and calls hooks.
+
+    The hook dict is compiled into a `HookNode` once, see `tackle.parser.plan`.
+
+    :return: cc_dict
+    """
+    logger.debug(
+        "Parsing context_key: %s and key: %s" % (context.context_key, context.key)
+    )
+    node = compile_hook(context, context.input_dict[context.context_key][context.key])
+    return parse_node(context, mode, source, node, append_key=append_key)
+
+
+async def aparse_hook(
+    context: 'Context',
+    mode: 'Mode',
+    source: 'Source',
+    executor: ThreadPoolExecutor = None,
+):
+    """Async counterpart of `parse_hook` awaiting hooks that implement `aexecute`.
+
+    Only single hooks are awaited, everything else, ie loops, hooks without
+    `aexecute` and `else` hooks, is run with `parse_hook` in the executor.
+    """
+    node = compile_hook(context, context.input_dict[context.context_key][context.key])
+    if (
+        'loop' in node.controls
+        or 'merge' in node.fields
+        or isinstance(node.controls.get('else'), dict)
+        or not isinstance(node.hook_type, str)
+        or is_template(node.hook_type)
+        or not get_hook(node.hook_type, context).is_async()
+    ):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, parse_hook, context, mode, source)
+
+    else_object = None
+    if 'else' in node.controls:
+        else_object = render_variable(context, node.controls['else'])
+
+    if evaluate_when(node.controls, context):
+        render_node(context, node)
+        context.output_dict[context.key], post_gen_hook = await arun_hook(
+            context, mode, source, trusted=True
+        )
+        if post_gen_hook:
+            context.post_gen_hooks.append(post_gen_hook)
+    elif else_object is not None:
+        context.output_dict[context.key] = render_variable(context, else_object)
 
     return context.output_dict
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""Incremental runs reusing the outputs of keys that haven't changed."""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+
+from tackle.exceptions import UnknownHookTypeException
+from tackle.parser.providers import get_hook
+from tackle.parser.scheduler import find_references
+from tackle.render import is_template
+from tackle.render.special_vars import SPECIAL_VARS, LazyVars
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from tackle.models import Context, Source
+
+logger = logging.getLogger(__name__)
+
+# Hook dict keys that act on more than the output of the key or prompt
+UNTRACKED_HOOK_KEYS = ('merge', 'post_gen_hook', 'confirm')
+
+
+class Fingerprints(object):
+    """Fingerprints and outputs of the hook keys of a previous run.
+
+    The fingerprint of a key is a hash of its unrendered input and of the
+    values of the variables it references, including special variables like
+    `cwd`, ie everything it is rendered from. When a key's fingerprint matches
+    the one recorded, its recorded output is reused instead of running the hook,
+    so only the keys that changed or depend on a key whose output changed are
+    run again. Only the outputs of the hooks declaring themselves `reusable` are
+    reused, the others, ie prompts, hooks with side effects or reading files or
+    the network, always run.
+
+    Keys are recorded per context file so that nested tackle runs share the
+    fingerprints of the run calling them.
+
+    :param path: File the fingerprints are recorded in.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Fingerprints of the keys being parsed
+        self.pending = {}
+        # Fingerprints and outputs of the keys parsed in this run
+        self.keys = {}
+        self.recorded = {}
+        self.lock = threading.Lock()
+        if os.path.isfile(path):
+            try:
+                with open(path, 'rb') as f:
+                    self.recorded = pickle.load(f)
+            except Exception as e:
+                logger.debug(f"Unable to read the fingerprints in {path} - {e}")
+
+    @staticmethod
+    def is_tracked(context: 'Context', raw: Any) -> bool:
+        """Return whether a key is a hook whose output can be reused."""
+        if not isinstance(raw, dict) or not isinstance(raw.get('type'), str):
+            return False
+        if is_template(raw['type']) or any(i in raw for i in UNTRACKED_HOOK_KEYS):
+            return False
+        try:
+            return get_hook(raw['type'], context).reusable
+        except UnknownHookTypeException:
+            # Raised when parsing the key
+            return False
+
+    @staticmethod
+    def fingerprint(context: 'Context', raw: Any) -> str:
+        """Return the fingerprint of a key from the current output."""
+        variables = dict(context.existing_context or {})
+        variables.update(context.output_dict)
+        references = find_references(context, raw)
+        if references is None or context.context_key in references:
+            # The whole output is referenced
+            references = variables.keys()
+        special_vars = LazyVars(context)
+        dependencies = {}
+        for i in references:
+            if i in SPECIAL_VARS:
+                # Take precedence over the output when rendering
+                dependencies[i] = special_vars[i]
+            elif i in variables:
+                dependencies[i] = variables[i]
+        return hashlib.sha256(
+            json.dumps(
+                {'raw': raw, 'dependencies': dependencies},
+                sort_keys=True,
+                default=repr,
+            ).encode()
+        ).hexdigest()
+
+    @staticmethod
+    def _key(context: 'Context', source: 'Source', key: str) -> tuple:
+        return source.repo_dir, source.context_file, context.context_key, key
+
+    def restore(self, context: 'Context', source: 'Source', key: str, raw: Any) -> bool:
+        """Set the recorded output of a key if its fingerprint is unchanged."""
+        if not self.is_tracked(context, raw):
+            return False
+        fingerprint_key = self._key(context, source, key)
+        fingerprint = self.fingerprint(context, raw)
+        with self.lock:
+            self.pending[fingerprint_key] = fingerprint
+            recorded = self.recorded.get(fingerprint_key)
+        if recorded is None or recorded[0] != fingerprint:
+            return False
+        logger.debug(f"Reusing the output of key='{key}'.")
+        context.output_dict[key] = recorded[1]
+        self.record(context, source, key)
+        return True
+
+    def record(self, context: 'Context', source: 'Source', key: str):
+        """Record the output of a key after it was parsed."""
+        fingerprint_key = self._key(context, source, key)
+        with self.lock:
+            fingerprint = self.pending.pop(fingerprint_key, None)
+            # Not when `when` was false
+            if fingerprint is not None and key in context.output_dict:
+                self.keys[fingerprint_key] = (fingerprint, context.output_dict[key])
+
+    def save(self):
+        """Write the fingerprints and outputs of the keys of this run.
+
+        Keys the run didn't get to, ie after an error, keep their records.
+        """
+        keys = {}
+        for k, v in {**self.recorded, **self.keys}.items():
+            try:
+                pickle.dumps(v)
+            except Exception as e:
+                logger.debug(f"Unable to record the output of key='{k[-1]}' - {e}")
+                continue
+            keys[k] = v
+        try:
+            with open(self.path, 'wb') as f:
+                pickle.dump(keys, f)
+        except OSError as e:
+            logger.debug(f"Unable to write the fingerprints to {self.path} - {e}")
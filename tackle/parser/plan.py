@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+"""Compiled execution plan of the hooks in a context file."""
+import hashlib
+import logging
+import marshal
+import os
+import pickle
+import sys
+
+from jinja2.exceptions import TemplateSyntaxError
+from pydantic import BaseModel
+
+from tackle import __version__
+from tackle.render import contains_template, get_environment, is_template
+from tackle.render.cache import TemplateCache
+
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+if TYPE_CHECKING:
+    from tackle.models import Context, Settings
+
+logger = logging.getLogger(__name__)
+
+# Keys of a hook dict that control how the hook is run and aren't passed to it
+CONTROL_KEYS = (
+    'when',
+    'else',
+    'loop',
+    'reverse',
+    'loop_workers',
+    'fail_fast',
+    'loop_chunk_size',
+    'loop_sink',
+)
+
+
+class HookNode(BaseModel):
+    """A hook dict split into its control keys and the fields of the hook.
+
+    Nodes are immutable so they can be shared by every run of the hook, ie the
+    items of a loop, instead of popping the control keys out of the input.
+    """
+
+    hook_type: Any
+    # Keys from `CONTROL_KEYS` in the hook dict, unrendered
+    controls: dict = {}
+    fields: dict = {}
+    # Block hooks render their own items when they are run
+    is_block: bool = False
+    # Whether the fields have anything to render
+    templated: bool = True
+
+    class Config:
+        allow_mutation = False
+
+
+def compile_hook(context: 'Context', raw: dict) -> HookNode:
+    """Return the node of a hook dict, compiled once per hook dict for a run."""
+    if context.template_cache is None:
+        context.template_cache = TemplateCache()
+    cached = context.template_cache.hook_nodes.get(raw, context.tackle_gen)
+    if cached is not None:
+        return cached
+
+    hook_type = raw.get('type')
+    is_block = 'block' in hook_type if isinstance(hook_type, str) else False
+    fields = {k: v for k, v in raw.items() if k not in CONTROL_KEYS}
+    node = HookNode(
+        hook_type=hook_type,
+        controls={k: raw[k] for k in CONTROL_KEYS if k in raw},
+        fields=fields,
+        is_block=is_block,
+        templated=not is_block and contains_template(context, fields),
+    )
+    context.template_cache.hook_nodes.set(raw, context.tackle_gen, node)
+    return node
+
+
+def _iter_templates(node: Any) -> Iterator[str]:
+    """Yield the strings in a node that need to be rendered by Jinja."""
+    if isinstance(node, str):
+        if is_template(node):
+            yield node
+    elif isinstance(node, dict):
+        for k, v in node.items():
+            yield from _iter_templates(k)
+            yield from _iter_templates(v)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _iter_templates(v)
+
+
+def _plan_path(
+    context: 'Context', settings: 'Settings', file_path: str, env_key
+) -> Optional[str]:
+    """Return where the plan of a file is cached, None if it can't be."""
+    if not settings.plans_dir:
+        return None
+    try:
+        with open(file_path, 'rb') as f:
+            digest = hashlib.sha256(f.read())
+    except OSError:
+        return None
+    # Compiled templates are only valid for this python and environment
+    digest.update(
+        repr((__version__, sys.version, context.tackle_gen, env_key)).encode()
+    )
+    return os.path.join(settings.plans_dir, digest.hexdigest() + '.pickle')
+
+
+def load_plan(context: 'Context', settings: 'Settings', file_path: str):
+    """Compile the hooks and templates of the context file for the run.
+
+    The plan of a file, ie its hook nodes and the code of its compiled templates,
+    is cached on disk in the `plans_dir` by the hash of the file so that the
+    next runs of it skip compiling them.
+
+    :param file_path: Path to the context file the input dict was read from.
+    """
+    if context.template_cache is None:
+        context.template_cache = TemplateCache()
+    inputs = context.input_dict[context.context_key]
+    env = get_environment(context, native=context.tackle_gen != 'cookiecutter')
+    plan_path = _plan_path(context, settings, file_path, env.registry_key)
+
+    plans = context.session.plans if context.session is not None else {}
+    plan = plans.get(plan_path)
+    if plan is None and plan_path and os.path.isfile(plan_path):
+        try:
+            with open(plan_path, 'rb') as f:
+                plan = pickle.load(f)
+        except Exception as e:
+            logger.debug(f"Unable to read the plan at {plan_path} - {e}")
+
+    if plan is not None:
+        if plan_path:
+            plans[plan_path] = plan
+        for key, (raw, node) in plan['nodes'].items():
+            # Inputs can be overwritten so the node is only used if unchanged
+            if inputs.get(key) == raw:
+                context.template_cache.hook_nodes.set(
+                    inputs[key], context.tackle_gen, HookNode(**node)
+                )
+        for source, code in plan['templates'].items():
+            context.template_cache.preload(
+                env.registry_key, source, env, marshal.loads(code)
+            )
+        return
+
+    plan = {'nodes': {}, 'templates': {}}
+    for key, raw in inputs.items():
+        if key.startswith('_') and not key.startswith('__'):
+            # Unrendered
+            continue
+        if isinstance(raw, dict) and 'type' in raw and not key.startswith('_'):
+            plan['nodes'][key] = (raw, compile_hook(context, raw).dict())
+        for source in _iter_templates(raw):
+            if source in plan['templates']:
+                continue
+            try:
+                code = env.compile(source)
+            except TemplateSyntaxError:
+                # Raised when the key is parsed
+                continue
+            context.template_cache.preload(env.registry_key, source, env, code)
+            plan['templates'][source] = marshal.dumps(code)
+
+    if plan_path:
+        plans[plan_path] = plan
+        try:
+            os.makedirs(os.path.dirname(plan_path), exist_ok=True)
+            with open(plan_path, 'wb') as f:
+                pickle.dump(plan, f)
+        except Exception as e:
+            logger.debug(f"Unable to write the plan to {plan_path} - {e}")
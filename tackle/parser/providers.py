@@ -1,18 +1,20 @@
 # -*- coding: utf-8 -*-
 
 """Parser for importing providers into the runtime."""
+import ast
 import re
 import os
+import json
 import logging
 import subprocess
 import sys
 import importlib.machinery
-import inspect
+import threading
 from tackle.providers import native_providers
 from tackle.utils.paths import listdir_absolute
 from tackle.repository import is_git_repo
 from tackle.exceptions import UnknownHookTypeException
-from tackle.models import Provider, BaseHook
+from tackle.models import Provider, HOOK_REGISTRY
 
 from typing import TYPE_CHECKING
 
@@ -21,6 +23,16 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Modules imported from providers by path, see `import_module_from_path`
+_provider_modules = {}
+_provider_modules_lock = threading.RLock()
+# Manifests of the hook types in providers by the file they are cached in, see
+# `get_provider_manifest`
+_manifests = {}
+_manifest_lock = threading.Lock()
+
+EXCLUDED_FILE_NAMES = ['pre_gen_project', 'post_gen_project', '__pycache__']
+
 
 # TODO: Integrate with parsing the input provider strings for DL from GH
 def parse_git_src_str(git_repo: str):
@@ -79,6 +91,16 @@ def import_with_fallback_install(mod_name, path):
         import_hooks_from_dir(mod_name, path)
 
 
+def import_hook_file(mod_name, path):
+    """Import a single file of hooks, fallback on the requirements file."""
+    mod = mod_name + '.' + os.path.basename(path).split('.')[0]
+    try:
+        import_module_from_path(mod, path)
+    except ModuleNotFoundError:
+        install_requirements_if_exists(os.path.dirname(os.path.dirname(path)))
+        import_module_from_path(mod, path)
+
+
 def get_provider_from_dir(mod_name, path):
     """Initialize the provider from a path."""
     import_with_fallback_install(mod_name, path)
@@ -95,7 +117,7 @@ def import_hooks_from_dir(
     importing all the relevent hooks into the context.
     """
     if excluded_file_names is None:
-        excluded_file_names = ['pre_gen_project', 'post_gen_project', '__pycache__']
+        excluded_file_names = EXCLUDED_FILE_NAMES
     if excluded_file_extensions is None:
         excluded_file_extensions = ['pyc']
 
@@ -112,28 +134,23 @@ def get_hook(hook_type, context: 'Context'):
     Get the hook from available providers.
 
     Does the following to return the hook:
-    1. Check if hook hasn't been imported already
-    2. Check if the hook has been declared in a provider's __init__.py's
-    `hook_types` field.
-    3. Try to import it then fall back on installing the requirements.txt file
+    1. Check if hook has been imported already, ie is in the `HOOK_REGISTRY`
+    2. Check if the hook is in a provider's manifest, see `get_provider_manifest`
+    3. Import the file defining it then fall back on installing the
+    requirements.txt file
     """
-    for h in BaseHook.__subclasses__():
-        if hook_type == inspect.signature(h).parameters['type'].default:
-            return h
+    if hook_type in HOOK_REGISTRY:
+        return HOOK_REGISTRY[hook_type]
 
     for p in context.providers:
-        if hook_type in p.hook_types:
-            import_with_fallback_install(p.name, p.path)
-
-    for h in BaseHook.__subclasses__():
-        if hook_type == inspect.signature(h).parameters['type'].default:
-            return h
-
-    avail_hook_types = [
-        inspect.signature(i).parameters['type'].default
-        for i in BaseHook.__subclasses__()
-    ]
-    logger.debug(f"Available hook types = {avail_hook_types}")
+        if hook_type in p.hook_files:
+            import_hook_file(p.name, p.hook_files[hook_type])
+            break
+
+    if hook_type in HOOK_REGISTRY:
+        return HOOK_REGISTRY[hook_type]
+
+    logger.debug(f"Available hook types = {list(HOOK_REGISTRY)}")
     raise UnknownHookTypeException(
         f"The hook type=\"{hook_type}\" is not available in the providers. "
         f"Run the application with `--verbose` to see available hook types."
@@ -141,15 +158,117 @@ def get_hook(hook_type, context: 'Context'):
 
 
 def import_module_from_path(mod, path):
-    """Import a module from a path presumably with hooks in it."""
-    # logger.debug(f"Importing module from path={path} as mod={mod}")
-    loader = importlib.machinery.SourceFileLoader(mod, path)
-    mod = loader.load_module()
-    return mod
+    """Import a module from a path presumably with hooks in it.
+
+    Modules are imported once per process and only imported again if the file
+    was modified since, so nested runs share the hooks of the providers instead
+    of defining them again.
+    """
+    mtime = os.path.getmtime(path)
+    with _provider_modules_lock:
+        cached = _provider_modules.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        # logger.debug(f"Importing module from path={path} as mod={mod}")
+        loader = importlib.machinery.SourceFileLoader(mod, path)
+        module = loader.load_module()
+        _provider_modules[path] = (mtime, module)
+        return module
+
+
+def scan_provider_hooks(path: str) -> dict:
+    """Statically find the hook types defined in a provider's hooks directory.
+
+    The files are parsed, not imported, looking for classes declaring a `type`
+    ie `type: str = 'print'`.
+
+    :return: Dict with `hook_files` mapping the hook types to the file they are
+        defined in and `eager_files`, the files with a `type` that isn't a
+        literal which need to be imported to know it.
+    """
+    hook_files = {}
+    eager_files = []
+    for f in sorted(listdir_absolute(path)):
+        if os.path.basename(f).split('.')[0] in EXCLUDED_FILE_NAMES:
+            continue
+        if not f.endswith('.py'):
+            continue
+        with open(f, 'rb') as fh:
+            tree = ast.parse(fh.read(), filename=f)
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.ClassDef):
+                continue
+            for i in node.body:
+                if not isinstance(i, ast.AnnAssign) or i.value is None:
+                    continue
+                if not isinstance(i.target, ast.Name) or i.target.id != 'type':
+                    continue
+                try:
+                    hook_type = ast.literal_eval(i.value)
+                except ValueError:
+                    hook_type = None
+                if isinstance(hook_type, str):
+                    hook_files[hook_type] = f
+                elif f not in eager_files:
+                    eager_files.append(f)
+    return {'hook_files': hook_files, 'eager_files': eager_files}
+
+
+def _provider_mtime(path: str) -> float:
+    """Return the last time a provider's hooks directory or its files changed."""
+    return max(
+        [os.path.getmtime(path)] + [os.path.getmtime(f) for f in listdir_absolute(path)]
+    )
 
 
-def append_provider_dicts(input_providers, context: 'Context', mode: 'Mode'):
-    """Update the provider list with a new provider."""
+def get_provider_manifest(path: str, settings: 'Settings') -> dict:
+    """Return the manifest of a hooks directory, see `scan_provider_hooks`.
+
+    Manifests are cached in the `providers_manifest` file of the settings and
+    scanned again when the directory or its files are modified.
+    """
+    path = os.path.abspath(path)
+    mtime = _provider_mtime(path)
+    manifest_path = settings.providers_manifest
+    with _manifest_lock:
+        manifest = _manifests.get(manifest_path)
+        if manifest is None:
+            manifest = _manifests[manifest_path] = {}
+            if manifest_path and os.path.isfile(manifest_path):
+                try:
+                    with open(manifest_path) as f:
+                        manifest.update(json.load(f))
+                except (OSError, ValueError) as e:
+                    logger.debug(f"Unable to read {manifest_path} - {e}")
+
+        entry = manifest.get(path)
+        if entry is not None and entry['mtime'] == mtime:
+            return entry
+
+        logger.debug(f"Scanning the hooks in {path}.")
+        entry = scan_provider_hooks(path)
+        entry['mtime'] = mtime
+        manifest[path] = entry
+        if manifest_path:
+            try:
+                os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+                tmp_path = f"{manifest_path}.{os.getpid()}"
+                with open(tmp_path, 'w') as f:
+                    json.dump(manifest, f)
+                os.replace(tmp_path, manifest_path)
+            except OSError as e:
+                logger.debug(f"Unable to write {manifest_path} - {e}")
+        return entry
+
+
+def append_provider_dicts(
+    input_providers, context: 'Context', mode: 'Mode', settings: 'Settings'
+):
+    """Update the provider list with a new provider.
+
+    Hooks aren't imported until they are used, the provider only knows the file
+    each hook type is defined in from its manifest.
+    """
     if isinstance(input_providers, str):
         # For providers from the context
         input_providers = [input_providers]
@@ -159,35 +278,20 @@ def append_provider_dicts(input_providers, context: 'Context', mode: 'Mode'):
         )
     logger.debug(f"Importing {input_providers}")
     for i in input_providers:
-        # if isinstance(context.provider_dict, str):
-        #     context.provider_dict = ""
-
         mod_name = 'tackle.providers.' + os.path.basename(i)
-        hooks_init_path = os.path.join(i, 'hooks', '__init__.py')
         hooks_path = os.path.join(i, 'hooks')
         logger.debug(f"Importing hook from provider={i} from path={hooks_path}")
-        if os.path.isfile(hooks_init_path):
-            mod = import_module_from_path(mod_name, hooks_init_path)
-            try:
-                hook_types = mod.hook_types
-                p = Provider(path=hooks_path, hook_types=hook_types, name=mod_name)
-                logger.debug(
-                    f"Importing hook_types {mod.hook_types} from {hooks_path}."
-                )
-                context.providers.append(p)
-                continue
-            except AttributeError:
-                logger.debug(f"No hook_types in {hooks_path}, importing module.")
-        # elif os.listdir(os.path.join(i, 'hooks')):
-
-        # elif os.path.isdir(hooks_path):
-        #     for i in [j for j in os.listdir(hooks_path) if j not in ['__pycache__']]:
-        #         import_module_from_path(mod_name, os.path.join(hooks_path, i))
-
-        # This pass will import all the modules and when retrieving hook types,
-        # wil search based on all subclasses
-        context.providers.append(get_provider_from_dir(mod_name, hooks_path))
-        continue
+        manifest = get_provider_manifest(hooks_path, settings)
+        for f in manifest['eager_files']:
+            import_hook_file(mod_name, f)
+        context.providers.append(
+            Provider(
+                path=hooks_path,
+                name=mod_name,
+                hook_types=list(manifest['hook_files']),
+                hook_files=manifest['hook_files'],
+            )
+        )
 
 
 def get_providers(
@@ -202,18 +306,29 @@ def get_providers(
 
     :return: List of Provider objects
     """
-    if len(context.providers) == 0:
-        # Native providers are gathered from
-        append_provider_dicts(native_providers, context, mode)
+    session = context.session
+    if len(context.providers) == 0 and session is not None and session.providers:
+        # Gathered by an earlier run of the session
+        context.providers = list(session.providers)
+    else:
+        if len(context.providers) == 0:
+            # Native providers are gathered from
+            append_provider_dicts(native_providers, context, mode, settings)
+
+        # Get provider dirs
+        if settings.extra_providers:
+            # Providers from config file
+            append_provider_dicts(settings.extra_providers, context, mode, settings)
 
-    # Get provider dirs
-    if settings.extra_providers:
-        # Providers from config file
-        append_provider_dicts(settings.extra_providers, context, mode)
+        if session is not None and session.providers is None:
+            session.providers = list(context.providers)
 
     if '__providers' in context.input_dict[context.context_key]:
         append_provider_dicts(
-            context.input_dict[context.context_key]['__providers'], context, mode
+            context.input_dict[context.context_key]['__providers'],
+            context,
+            mode,
+            settings,
         )
 
     # hooks_dir = os.path.join(source.repo_dir, 'hooks')
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+"""Scheduler running the hooks of a context that don't depend on each other."""
+import asyncio
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from jinja2 import meta
+from jinja2.exceptions import TemplateSyntaxError
+
+from tackle.exceptions import UnknownHookTypeException
+from tackle.parser.hooks import isolate_context
+from tackle.parser.providers import get_hook
+from tackle.render import get_environment, is_template
+
+from typing import TYPE_CHECKING, Any, Callable, Optional, Set
+
+if TYPE_CHECKING:
+    from tackle.models import Context, Mode, Source
+
+logger = logging.getLogger(__name__)
+
+# Hook dict keys that change the process or the rest of the output
+SERIAL_HOOK_KEYS = ('merge', 'chdir', 'confirm', 'post_gen_hook')
+
+
+class HookScheduler(object):
+    """Run the keys of a context with independent hooks concurrently.
+
+    Each key is checked for the earlier keys it references by walking the Jinja
+    AST of all the strings in it, ie its input, `when`, `loop` and `else`.
+    Hooks that declare themselves `parallel_safe` are then run on a copy of the
+    context as soon as the keys they reference are done, while every other key
+    (prompts, hooks with side effects, plain values) waits for everything before
+    it and runs on its own.
+
+    Hooks implementing `aexecute` are awaited together on an event loop, the
+    others are run on a thread pool of `hook_workers` threads. The event loop
+    only runs while waiting on the hooks so that keys run on their own, ie a
+    nested tackle run, can run their own.
+
+    The outputs are written into the output dict in the order of the keys.
+
+    :param parse_key: Function parsing a single key, see
+        `tackle.parser.context.parse_key`.
+    :param aparse_key: Async counterpart of `parse_key`.
+    """
+
+    def __init__(
+        self,
+        context: 'Context',
+        mode: 'Mode',
+        source: 'Source',
+        parse_key: Callable,
+        aparse_key: Callable,
+    ):
+        self.context = context
+        self.mode = mode
+        self.source = source
+        self.parse_key = parse_key
+        self.aparse_key = aparse_key
+        # Tasks of the running keys in the order of the keys
+        self.pending = OrderedDict()
+        self.loop = None
+
+    def run(self):
+        """Parse all the keys of the context."""
+        context = self.context
+        items = list(context.input_dict[context.context_key].items())
+        keys = {k for k, _ in items}
+        self.loop = asyncio.new_event_loop()
+        try:
+            with ThreadPoolExecutor(max_workers=context.hook_workers) as pool:
+                try:
+                    for key, raw in items:
+                        if not self.is_parallel(key, raw):
+                            self.wait()
+                            self.parse_key(context, self.mode, self.source, key, raw)
+                            continue
+
+                        references = self.references(raw)
+                        if references is None or context.context_key in references:
+                            # The whole output is referenced
+                            self.wait()
+                        else:
+                            self.wait(keys & references)
+
+                        logger.debug("Scheduling key: %s" % key)
+                        self.pending[key] = self.loop.create_task(
+                            self.parse_in_copy(isolate_context(context), key, pool)
+                        )
+                    self.wait()
+                except BaseException:
+                    self.cancel()
+                    raise
+        finally:
+            self.loop.close()
+
+    def is_parallel(self, key: str, raw: Any) -> bool:
+        """Return whether a key is a hook that can run alongside others."""
+        if key.startswith('_'):
+            return False
+        if self.context.overwrite_inputs and key in self.context.overwrite_inputs:
+            return False
+        if not isinstance(raw, dict) or 'type' not in raw:
+            return False
+        if not isinstance(raw['type'], str) or is_template(raw['type']):
+            return False
+        if any(i in raw for i in SERIAL_HOOK_KEYS):
+            return False
+        if isinstance(raw.get('else'), dict):
+            # Could be any other hook
+            return False
+        try:
+            Hook = get_hook(raw['type'], self.context)
+        except UnknownHookTypeException:
+            # Let it be raised in order
+            return False
+        return Hook.parallel_safe
+
+    def references(self, raw: Any) -> Optional[Set[str]]:
+        """Return the variables referenced in a value, None if the whole output."""
+        return find_references(self.context, raw)
+
+    async def parse_in_copy(
+        self, context: 'Context', key: str, executor: ThreadPoolExecutor
+    ) -> 'Context':
+        """Parse a key within a copy of the context and return the copy."""
+        await self.aparse_key(context, self.mode, self.source, key, executor)
+        return context
+
+    def wait(self, keys: Set[str] = None):
+        """Write the outputs of the running keys in order.
+
+        :param keys: Only wait until these keys are done, defaults to all of them.
+        """
+        if keys is not None:
+            keys = keys & self.pending.keys()
+            if not keys:
+                return
+        while self.pending:
+            key, task = self.pending.popitem(last=False)
+            context = self.loop.run_until_complete(task)
+            if key in context.output_dict:
+                self.context.output_dict[key] = context.output_dict[key]
+            self.context.post_gen_hooks.extend(context.post_gen_hooks)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    return
+
+    def cancel(self):
+        """Cancel the running keys and wait for them to stop."""
+        tasks = list(self.pending.values())
+        self.pending.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+
+def find_references(context: 'Context', raw: Any) -> Optional[Set[str]]:
+    """Return the variables referenced in a value, None if the whole output.
+
+    All the strings in the value, ie its input, `when`, `loop` and `else`, are
+    parsed and the undeclared variables of their Jinja AST are collected.
+    """
+    references = set()
+    for value in _iter_strings(raw):
+        if not is_template(value):
+            continue
+        try:
+            ast = get_environment(context).parse(value)
+        except TemplateSyntaxError:
+            return None
+        references.update(meta.find_undeclared_variables(ast))
+    if references & {'this', 'output', 'cookiecutter'}:
+        return None
+    return references
+
+
+def is_loop_target(context: 'Context') -> bool:
+    """Return whether the output of the current key is only used by a later loop.
+
+    Such an output can be a generator consumed as the loop runs, see the `lazy`
+    option of the `listdir` and `file_lines` hooks. Any other reference to the
+    key, ie in the input of a hook or in `{{ this }}`, needs a list instead.
+    """
+    inputs = context.input_dict.get(context.context_key) or {}
+    keys = list(inputs)
+    if context.key not in keys:
+        return False
+    loops = 0
+    for key in keys[keys.index(context.key) + 1 :]:
+        raw = inputs[key]
+        if isinstance(raw, dict) and 'loop' in raw:
+            references = find_references(context, raw['loop'])
+            if references is None:
+                return False
+            loops += context.key in references
+            raw = {k: v for k, v in raw.items() if k != 'loop'}
+        references = find_references(context, raw)
+        if references is None or context.key in references:
+            return False
+    return loops == 1
+
+
+def _iter_strings(node: Any):
+    """Yield all the strings in a node, including the keys of dicts."""
+    if isinstance(node, str):
+        yield node
+    elif isinstance(node, dict):
+        for k, v in node.items():
+            yield from _iter_strings(k)
+            yield from _iter_strings(v)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _iter_strings(v)
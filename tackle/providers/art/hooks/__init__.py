@@ -1,2 +1 @@
 """Art hooks."""
-hook_types = ["text2art", "tprint"]
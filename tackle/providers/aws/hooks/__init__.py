@@ -1,2 +1 @@
 """AWS hooks."""
-hook_types = ["aws_regions", "aws_azs", "aws_ec2_types"]
@@ -4,11 +4,13 @@
 from __future__ import unicode_literals
 from __future__ import print_function
 
+import asyncio
 import logging
 import boto3
 from typing import List
 
 from tackle.models import BaseHook
+from tackle.utils import run_in_thread
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,7 @@ class AwsRegionsHook(BaseHook):
     """
 
     type: str = 'aws_regions'
+    parallel_safe = True
 
     def execute(self):
         client = boto3.client('ec2', region_name='us-east-1')
@@ -40,24 +43,26 @@ class AwsAzsHook(BaseHook):
     """
 
     type: str = 'aws_azs'
+    parallel_safe = True
     region: str = None
     regions: List = []
 
-    def execute(self):
+    async def aexecute(self):
         if self.region:
-            client = boto3.client('ec2', region_name=self.region)
-            azs = self._call_azs(client, self.region)
-            azs.sort()
-            return azs
+            return await run_in_thread(self._get_azs, self.region)
 
-        else:
-            output = {}
-            for r in self.regions:
-                client = boto3.client('ec2', region_name=r)
-                azs = self._call_azs(client, r)
-                azs.sort()
-                output.update({r: azs})
-            return output
+        # Query the regions concurrently
+        azs = await asyncio.gather(
+            *[run_in_thread(self._get_azs, r) for r in self.regions]
+        )
+        return dict(zip(self.regions, azs))
+
+    def _get_azs(self, region):
+        # Sessions aren't thread safe so each thread gets its own client
+        client = boto3.session.Session().client('ec2', region_name=region)
+        azs = self._call_azs(client, region)
+        azs.sort()
+        return azs
 
     @staticmethod
     def _call_azs(client, region):
@@ -84,6 +89,7 @@ class AwsEc2TypesHook(BaseHook):
     """
 
     type: str = 'aws_ec2_types'
+    parallel_safe = True
     region: str = None
     regions: List = []
     instance_families: List = None
@@ -1,2 +1 @@
 """Azure hooks."""
-hook_types = ["azure_regions", "azure_vm_types"]
@@ -25,6 +25,7 @@ class AzureRegionsHook(BaseHook):
     """
 
     type: str = 'azure_regions'
+    parallel_safe = True
 
     def execute(self):
         subscription_id = os.environ['ARM_SUBSCRIPTION_ID']
@@ -54,6 +55,7 @@ class AzureVMTypesHook(BaseHook):
     """
 
     type: str = 'azure_vm_types'
+    parallel_safe = True
     region: str
     instance_families: List = None
 
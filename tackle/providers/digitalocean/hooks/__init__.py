@@ -1,2 +1 @@
 """DigitalOcean hooks."""
-hook_types = ["digitalocean_regions", "digitalocean_instance_types"]
@@ -21,6 +21,7 @@ class DigitalOceanRegionsHook(BaseHook):
     """
 
     type: str = 'digitalocean_regions'
+    parallel_safe = True
     # region: str
 
     def execute(self):
@@ -41,6 +42,7 @@ class DigitalOceanInstanceTypesHook(BaseHook):
     """
 
     type: str = 'digitalocean_instance_types'
+    parallel_safe = True
     region: str
     instance_families: List = None
 
@@ -1,2 +1 @@
 """GCP hooks."""
-hook_types = ["gcp_regions", "gcp_azs", "gcp_instance_types"]
@@ -4,10 +4,12 @@
 from __future__ import unicode_literals
 from __future__ import print_function
 
+import asyncio
 import logging
 from googleapiclient.discovery import build
 
 from tackle.models import BaseHook
+from tackle.utils import run_in_thread
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,7 @@ class GcpRegionsHook(BaseHook):
     """
 
     type: str = 'gcp_regions'
+    parallel_safe = True
     gcp_project: str
 
     def execute(self):
@@ -44,25 +47,28 @@ class GcpAzsHook(BaseHook):
     """
 
     type: str = 'gcp_azs'
+    parallel_safe = True
     gcp_project: str
     region: str = None
     regions: list = None
 
-    def execute(self):
-        client = build('compute', 'v1')
-
+    async def aexecute(self):
         if self.region:
-            azs = self._call_azs(client, self.region, self.gcp_project)
-            azs.sort()
-            return azs
+            return await run_in_thread(self._get_azs, self.region)
 
         elif self.regions:
-            output = {}
-            for r in self.regions:
-                azs = self._call_azs(client, r, self.gcp_project)
-                azs.sort()
-                output.update({r: azs})
-            return output
+            # Query the regions concurrently
+            azs = await asyncio.gather(
+                *[run_in_thread(self._get_azs, r) for r in self.regions]
+            )
+            return dict(zip(self.regions, azs))
+
+    def _get_azs(self, region):
+        # The client's http object isn't thread safe so each thread builds its own
+        client = build('compute', 'v1')
+        azs = self._call_azs(client, region, self.gcp_project)
+        azs.sort()
+        return azs
 
     @staticmethod
     def _call_azs(client, region, project):
@@ -92,6 +98,7 @@ class GcpInstanceTypesHook(BaseHook):
     """
 
     type: str = 'gcp_instance_types'
+    parallel_safe = True
     gcp_project: str
     zone: str
     instance_families: list = None
@@ -1,2 +1 @@
 """Git hooks."""
-hook_types = ["git_clone", "meta_repo"]
@@ -1,5 +1 @@
 """Github hooks."""
-hook_types = [
-    "github_repo_names",
-    "github_repo_releases",
-]
@@ -57,6 +57,7 @@ class GithubRepoHook(GithubBaseHook, BaseHook):
     """
 
     type: str = 'github_repo_names'
+    parallel_safe = True
 
     def execute(self):
         """Run the hook."""
@@ -72,6 +73,7 @@ class GithubRepoReleasesHook(GithubBaseHook, BaseHook):
     """
 
     type: str = 'github_repo_releases'
+    parallel_safe = True
     repo: str
 
     def execute(self):
@@ -40,6 +40,7 @@ class RequestsGetHook(BaseHook):
     """
 
     type: str = 'get'
+    parallel_safe = True
     no_exit: bool = False
 
     url: str
@@ -27,14 +27,22 @@ class DictUpdateHook(BaseHook):
     input: Union[Dict, List[Dict]]
     src: Dict
 
-    def execute(self):
-        if isinstance(self.input, list):
-            for i in self.input:
-                self.src.update(i)
+    @staticmethod
+    def _update(src, input):
+        if isinstance(input, list):
+            for i in input:
+                src.update(i)
         else:
-            self.src.update(self.input)
+            src.update(input)
+
+        return src
+
+    def execute(self):
+        return self._update(self.src, self.input)
 
-        return self.src
+    @classmethod
+    def execute_batch(cls, items):
+        return [cls._update(i['src'], i['input']) for i in items]
 
 
 class DictMergeHook(BaseHook):
@@ -92,6 +100,7 @@ class DictKeysHook(BaseHook):
     """
 
     type: str = 'dict_keys'
+    reusable = True
 
     src: Union[Dict, List[Dict]]
 
@@ -14,6 +14,7 @@ from typing import List, Union, Any
 
 from tackle.models import BaseHook
 from tackle.exceptions import HookCallException
+from tackle.parser.scheduler import is_loop_target
 
 logger = logging.getLogger(__name__)
 
@@ -255,3 +256,33 @@ class CreateFileHook(BaseHook):
             Path(i).touch()
 
         return self.path
+
+
+def _iter_lines(path: str):
+    """Yield the lines of a file without the line endings."""
+    with open(path) as f:
+        for line in f:
+            yield line.rstrip('\r\n')
+
+
+class FileLinesHook(BaseHook):
+    """
+    Hook to read the lines of a file.
+
+    :param path: The path to the file.
+    :param lazy: Return a generator reading the file as it is consumed by a
+        `loop` instead of a list. Only when the key is used by a single later
+        `loop` and nothing else, a list is returned otherwise. The key is removed
+        from the output once the loop is done.
+    :return: List or generator of lines without line endings.
+    """
+
+    type: str = 'file_lines'
+    path: str
+    lazy: bool = False
+
+    def execute(self):
+        lines = _iter_lines(os.path.abspath(os.path.expanduser(self.path)))
+        if self.lazy and is_loop_target(self):
+            return lines
+        return list(lines)
@@ -12,7 +12,7 @@ from typing import Dict, Union
 
 from tackle.models import BaseHook
 from tackle.exceptions import UndefinedVariableInTemplate
-from tackle.render.environment import StrictEnvironment
+from tackle.render import get_environment
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +35,9 @@ class JinjaHook(BaseHook):
     extra_context: Dict = {}
 
     def execute(self):
-        env = StrictEnvironment(context=self.input_dict)
-        env.loader = FileSystemLoader(self.file_system_loader)
+        env = get_environment(self).overlay(
+            loader=FileSystemLoader(self.file_system_loader)
+        )
         template = env.get_template(self.template_path)
 
         jinja_context = dict(self.output_dict)
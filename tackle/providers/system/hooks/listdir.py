@@ -9,6 +9,7 @@ import os
 import logging
 
 from tackle.models import BaseHook
+from tackle.parser.scheduler import is_loop_target
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,11 @@ class ListdirHook(BaseHook):
     :param path: String or list to directories to list
     :param sort: Boolean to sort the output
     :param ignore_hidden_files: Boolean to ignore hidden files
+    :param lazy: Return a generator scanning the directory as it is consumed by
+        a `loop` instead of a list when the `path` is a string and the output
+        isn't sorted. Only when the key is used by a single later `loop` and
+        nothing else, a list is returned otherwise. The key is removed from the
+        output once the loop is done.
 
     :return: A list of contents of the `path` if input is string,
         A map with keys of items if input `path` is list.
@@ -29,10 +35,26 @@ class ListdirHook(BaseHook):
     ignore_hidden_files: bool = False
     path: Union[List[str], str]
     sort: bool = False
+    lazy: bool = False
     # TODO: Put a filter on the input here with a regex
     # filter:
 
+    def _scan(self):
+        with os.scandir(os.path.expanduser(self.path)) as entries:
+            for i in entries:
+                if self.ignore_hidden_files and i.name.startswith('.'):
+                    continue
+                yield i.name
+
     def execute(self):
+        if (
+            isinstance(self.path, str)
+            and self.lazy
+            and not self.sort
+            and is_loop_target(self)
+        ):
+            return self._scan()
+
         if isinstance(self.path, str):
             files = os.listdir(os.path.expanduser(self.path))
             if self.sort:
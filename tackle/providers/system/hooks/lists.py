@@ -47,6 +47,7 @@ class ListRemoveHook(BaseHook):
     """
 
     type: str = 'list_remove'
+    reusable = True
     input: List
     item: str = None
     items: List = None
@@ -72,6 +73,7 @@ class ListFromDictHook(BaseHook):
     """
 
     type: str = 'list_from_dict'
+    reusable = True
     keys: List
     input: dict
 
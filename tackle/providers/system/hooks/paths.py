@@ -26,6 +26,10 @@ class PathExistsListHook(BaseHook):
     def execute(self):
         return os.path.exists(self.path)
 
+    @classmethod
+    def execute_batch(cls, items):
+        return [os.path.exists(i['path']) for i in items]
+
 
 class PathIsdirListHook(BaseHook):
     """
@@ -42,6 +46,10 @@ class PathIsdirListHook(BaseHook):
         """Run the prompt."""
         return os.path.isdir(self.path)
 
+    @classmethod
+    def execute_batch(cls, items):
+        return [os.path.isdir(i['path']) for i in items]
+
 
 class FindInParentHook(BaseHook):
     """
@@ -118,6 +126,7 @@ class PathJoinHook(BaseHook):
     """
 
     type: str = 'path_join'
+    reusable = True
     paths: list
 
     def execute(self):
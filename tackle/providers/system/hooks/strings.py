@@ -22,20 +22,29 @@ class SplitHook(BaseHook):
     """
 
     type: str = 'split'
+    reusable = True
     separator: str = "."
     input: Union[List[str], str]
 
-    def execute(self):
-        if isinstance(self.input, str):
+    @staticmethod
+    def _split(input, separator):
+        if isinstance(input, str):
             # If item is a string then return a list
-            return self.input.split(self.separator)
-        elif isinstance(self.input, list):
+            return input.split(separator)
+        elif isinstance(input, list):
             # If input is a list then return a nested list
             output = []
-            for i in self.input:
-                output.append(i.split(self.separator))
+            for i in input:
+                output.append(i.split(separator))
             return output
 
+    def execute(self):
+        return self._split(self.input, self.separator)
+
+    @classmethod
+    def execute_batch(cls, items):
+        return [cls._split(i['input'], i['separator']) for i in items]
+
 
 class JoinHook(BaseHook):
     """
@@ -47,9 +56,14 @@ class JoinHook(BaseHook):
     """
 
     type: str = 'join'
+    reusable = True
 
     separator: str = '.'
     input: List[str]
 
     def execute(self):
         return self.separator.join(self.input)
+
+    @classmethod
+    def execute_batch(cls, items):
+        return [i['separator'].join(i['input']) for i in items]
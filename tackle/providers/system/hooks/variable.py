@@ -4,6 +4,7 @@
 from __future__ import unicode_literals
 from __future__ import print_function
 
+import copy
 import logging
 import re
 from typing import Union, List, Dict, Any
@@ -26,6 +27,7 @@ class VarHook(BaseHook):
     """
 
     type: str = 'var'
+    reusable = True
 
     # TODO: Figure out what the right constraints are.  Fails tests and casts a
     #  list of lists into a dict for some reason. Any is too loose and
@@ -37,30 +39,49 @@ class VarHook(BaseHook):
     merge_config: bool = None
     merge_dict: Dict = None
 
-    def _remove_from_contents(self, regex):
-        if isinstance(self.input, list):
-            self.input = [i for i in self.input if not re.search(regex, i)]
-        if isinstance(self.input, dict):
-            for k in list(self.input.keys()):
+    @staticmethod
+    def _remove_from_contents(input, regex):
+        if isinstance(input, list):
+            input = [i for i in input if not re.search(regex, i)]
+        if isinstance(input, dict):
+            for k in list(input.keys()):
                 if re.search(regex, k):
-                    self.input.pop(k)
+                    input.pop(k)
+        return input
 
-    def execute(self):
-        if self.remove:
-            if isinstance(self.remove, str):
-                self._remove_from_contents(self.remove)
+    @classmethod
+    def _process(cls, input, remove=None, update=None, merge_dict=None, **kwargs):
+        # The input can be a rendered object from the output so don't modify it
+        # in place
+        input = copy.copy(input)
+
+        if remove:
+            if isinstance(remove, str):
+                input = cls._remove_from_contents(input, remove)
 
-            if isinstance(self.remove, list):
-                for i in self.remove:
-                    self._remove_from_contents(i)
+            if isinstance(remove, list):
+                for i in remove:
+                    input = cls._remove_from_contents(input, i)
 
-        if self.update:
-            self.input.update(self.update)
+        if update:
+            input.update(update)
 
-        if self.merge_dict:
-            self.input = merge_configs(self.input, self.merge_dict)
+        if merge_dict:
+            input = merge_configs(input, merge_dict)
 
-        return self.input
+        return input
+
+    def execute(self):
+        return self._process(
+            self.input,
+            remove=self.remove,
+            update=self.update,
+            merge_dict=self.merge_dict,
+        )
+
+    @classmethod
+    def execute_batch(cls, items):
+        return [cls._process(**i) for i in items]
 
 
 # TODO: Keep till 0.2+
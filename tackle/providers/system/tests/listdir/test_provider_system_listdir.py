@@ -11,3 +11,6 @@ def test_provider_system_hook_listdir(change_dir):
     assert len(output['string_input']) == 3
     assert len(output['string_input_sorted']) == 2
     assert len(output['list_input']['dirs/dir1']) == 2
+    # Not consumed by a loop so it is listed
+    assert isinstance(output['string_input_lazy'], list)
+    assert sorted(output['string_input_lazy']) == sorted(output['string_input'])
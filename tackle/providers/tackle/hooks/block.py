@@ -35,6 +35,11 @@ class BlockHook(BaseHook):
             overwrite_inputs=self.overwrite_inputs,
             override_inputs=self.override_inputs,
             context_key=self.context_key,
+            template_cache=self.template_cache,
+            env_registry=self.env_registry,
+            hook_cache=self.hook_cache,
+            providers=self.providers,
+            session=self.session,
         )
         mode = Mode(no_input=self.no_input)
         source = Source()
@@ -37,6 +37,9 @@ class GenerateHook(BaseHook):
             output_dict=self.output_dict,
             context_key=self.context_key,
             tackle_gen='tackle',
+            template_cache=self.template_cache,
+            env_registry=self.env_registry,
+            hook_cache=self.hook_cache,
         )
 
         source = Source(repo_dir=self.project_dir)
@@ -6,10 +6,14 @@ from __future__ import print_function
 
 import tackle as tkl
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Any
 from pydantic import SecretStr
 
+from tackle.exceptions import HookCallException
 from tackle.models import BaseHook
+from tackle.session import run_in_worker
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +42,8 @@ class TackleHook(BaseHook):
     :param directory: Relative path to a tackle box / cookiecutter template
         in a repository.
     :param accept_hooks: Accept pre and post hooks if set to `True`.
+    :param workers: Number of processes to run the `templates`, `directories` and
+        `context_files` in, one after the other if not set. Requires `no_input`.
 
     :return: Dictionary of output
     """
@@ -61,6 +67,7 @@ class TackleHook(BaseHook):
     directory: str = None
     directories: List = None
     skip_if_file_exists: bool = False
+    workers: int = None
 
     def execute(self):
 
@@ -68,25 +75,44 @@ class TackleHook(BaseHook):
         if not self.templates and not self.directories and not self.context_files:
             return self._run_tackle()
 
-        output = {}
+        if self.workers and not self.no_input:
+            raise HookCallException(
+                "Can't run tackle hooks with `workers` without `no_input`."
+            )
+
+        runs = []
         if self.templates:
             for i in self.templates:
                 self.template = i
-                output.update({i: self._run_tackle()})
+                runs.append((i, self._tackle_kwargs()))
 
         if self.directories:
             for i in self.directories:
                 self.directory = i
-                output.update({i: self._run_tackle()})
+                runs.append((i, self._tackle_kwargs()))
 
         if self.context_files:
             for i in self.context_files:
                 self.context_file = i
-                output.update({i: self._run_tackle()})
+                runs.append((i, self._tackle_kwargs()))
+
+        if not self.workers:
+            return {i: dict(tkl.main.tackle(**kwargs)) for i, kwargs in runs}
 
-        return output
+        # Each run gets its own process and so its own working directory
+        cwd = os.getcwd()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = []
+            for i, kwargs in runs:
+                for k in PROCESS_EXCLUDED_KWARGS:
+                    kwargs.pop(k)
+                futures.append((i, executor.submit(run_in_worker, cwd, kwargs)))
+            return {i: future.result() for i, future in futures}
 
     def _run_tackle(self):
+        return dict(tkl.main.tackle(**self._tackle_kwargs()))
+
+    def _tackle_kwargs(self) -> dict:
 
         # Populate defaults.
         # Default because passing the render context from tackle to tackle is
@@ -96,7 +122,13 @@ class TackleHook(BaseHook):
         else:
             existing_context = self.output_dict
 
-        output_context = tkl.main.tackle(
+        # Nested runs reuse the settings and caches of the calling run unless
+        # they are given their own config
+        session = None
+        if self.config_file is None and not self.default_config:
+            session = self.session
+
+        return dict(
             template=self.template,
             checkout=self.checkout,
             no_input=self.no_input,
@@ -107,6 +139,9 @@ class TackleHook(BaseHook):
             replay=self.replay,
             rerun=self.rerun,
             record=self.record,
+            incremental=self.incremental,
+            checkpoint=self.checkpoint,
+            resume=self.resume,
             overwrite_if_exists=self.overwrite_if_exists,
             output_dir=self.output_dir,
             config_file=self.config_file,
@@ -114,6 +149,22 @@ class TackleHook(BaseHook):
             password=self.password,
             directory=self.directory,
             skip_if_file_exists=self.skip_if_file_exists,
+            template_cache=self.template_cache,
+            env_registry=self.env_registry,
+            fingerprints=self.fingerprints,
+            journal=self.journal,
+            session=session,
         )
 
-        return dict(output_context)
+
+# Arguments holding the state of the calling run which stays in its process
+PROCESS_EXCLUDED_KWARGS = (
+    'incremental',
+    'checkpoint',
+    'resume',
+    'template_cache',
+    'env_registry',
+    'fingerprints',
+    'journal',
+    'session',
+)
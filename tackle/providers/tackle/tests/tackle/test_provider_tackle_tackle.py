@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 """Tests dict input objects for `tackle.providers.tackle.hooks.tackle` module."""
+from tackle.exceptions import HookCallException
 from tackle.main import tackle
 
 import pytest
@@ -32,3 +33,17 @@ def test_provider_tackle_remote(change_dir, clean_outputs):
     output = tackle('remote.yaml', no_input=True)
     # assert output['shell']['foo'] == 'bing'
     assert output
+
+
+def test_provider_tackle_workers(change_dir):
+    """Verify the context files are run in worker processes."""
+    output = tackle(context_file='workers.yaml', no_input=True)
+    assert list(output['fanned_out']) == ['a.yaml', 'b.yaml']
+    assert output['fanned_out']['a.yaml']['stuff'] == 'a-things'
+    assert output['fanned_out']['b.yaml']['stuff'] == 'b-things'
+
+
+def test_provider_tackle_workers_input(change_dir):
+    """Verify workers can't be used with prompts."""
+    with pytest.raises(HookCallException):
+        tackle(context_file='workers-input.yaml')
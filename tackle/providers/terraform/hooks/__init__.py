@@ -1,5 +1 @@
 """Terraform hooks."""
-hook_types = [
-    "terraform_variables",
-    "terraform_version",
-]
@@ -1,4 +1 @@
-"""Terraform hooks."""
-hook_types = [
-    "toml",
-]
+"""Toml hooks."""
@@ -1,4 +1 @@
-"""Terraform hooks."""
-# hook_types = [
-#     "yubikey_read",
-# ]
+"""Yubikey hooks."""
@@ -2,32 +2,187 @@
 import ast
 import re
 import six
-
-from tackle.render.environment import StrictEnvironment
-from tackle.render.special_vars import get_vars
+from collections import ChainMap
+from collections.abc import Mapping
+from itertools import chain, islice
+from jinja2 import Undefined
+
+from tackle.render.cache import TemplateCache
+from tackle.render.context import OutputView, RenderContext
+from tackle.render.environment import EnvironmentRegistry, StrictEnvironment
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from tackle.models import Context
 
 
-def build_render_context(context: 'Context'):
+def get_environment(
+    context: 'Context', extensions_context: dict = None, **kwargs
+) -> StrictEnvironment:
+    """Return the run's shared environment for the given configuration.
+
+    :param extensions_context: Dict to read the `_extensions` from, defaults to
+        the context's `input_dict`.
+    :param kwargs: Keyword arguments passed to the environment, ie `native` to
+        render to python types.
+    """
+    if context.env_registry is None:
+        context.env_registry = EnvironmentRegistry()
+    if extensions_context is None:
+        extensions_context = context.input_dict
+    return context.env_registry.get_environment(extensions_context, **kwargs)
+
+
+def build_render_context(context: 'Context') -> RenderContext:
     """Depending on the generation build a context.
 
     For cookiecutter, enforce standards ie '{{ cookiecutter.var }}' but for tackle,
     support both ie '{{ cookiecutter.var }}' and '{{ var }}'.
+
+    The context is a read-only view over the output which is kept on the context
+    and only rebuilt when the output dict itself is replaced.
     """
-    # TODO: get_vars should be instantiated earlier...
-    special_variables = get_vars(context)
-    if context.tackle_gen == 'cookiecutter':
-        render_context = {'cookiecutter': context.output_dict}
-        render_context.update(special_variables)
+    render_context = context.render_context
+    if render_context is None or (
+        render_context.state != RenderContext.context_state(context)
+    ):
+        render_context = context.render_context = RenderContext.from_context(context)
+    return render_context
+
+
+def new_shared_context(template, render_context: Mapping):
+    """Return a Jinja context using the render context as is for its variables.
+
+    Jinja copies the variables into a new dict on each render so instead the
+    layers of the render context are shared, with the template's globals as the
+    last layer.
+    """
+    if isinstance(render_context, ChainMap):
+        layers = render_context.maps + [template.globals]
     else:
-        render_context = dict(
-            context.output_dict, **{context.context_key: dict(context.output_dict)}
+        layers = [render_context, template.globals]
+    return template.new_context(ChainMap(*layers), shared=True)
+
+
+def render_template(template, render_context: Mapping):
+    """Render a template to a string without copying the render context."""
+    ctx = new_shared_context(template, render_context)
+    try:
+        return ''.join(template.root_render_func(ctx))
+    except Exception:
+        return template.environment.handle_exception()
+
+
+TEMPLATE_MARKERS = ('{{', '{%', '{#')
+
+# Tackle evaluates dicts, lists, and bools as literals where as cookiecutter
+# renders them to string
+LITERAL_REGEX = [
+    re.compile(r'^\[.*\]$'),  # List
+    re.compile(r'^\{.*\}$'),  # Dict
+    re.compile(r'^True$|^False$'),  # Boolean
+    re.compile(r'^\d+$'),  # Integer
+    re.compile(r'^[+-]?([0-9]+([.][0-9]*)?|[.][0-9]+)$'),  # Float
+]
+LITERAL_FIRST_CHARS = frozenset('[{TF0123456789+-.')
+
+
+def is_template(raw: str) -> bool:
+    """Return whether a string needs to go through Jinja to be rendered.
+
+    Besides the template markers, Jinja strips a single trailing newline and
+    normalizes line endings so those strings are rendered as well.
+    """
+    for marker in TEMPLATE_MARKERS:
+        if marker in raw:
+            return True
+    return raw.endswith('\n') or '\r' in raw
+
+
+def is_literal(raw: str) -> bool:
+    """Return whether a rendered string is evaluated as a python literal."""
+    if not raw or raw[0] not in LITERAL_FIRST_CHARS:
+        return False
+    for r in LITERAL_REGEX:
+        if r.search(raw):
+            return True
+    return False
+
+
+def evaluate_literal(context: 'Context', rendered: str):
+    """Return a rendered string as a literal for tackle generation."""
+    if context.tackle_gen == 'cookiecutter':
+        return rendered
+    if is_literal(rendered):
+        # If variable looks like list, return literal list
+        return ast.literal_eval(rendered)
+    return rendered
+
+
+def _is_static(node: Any, tackle_gen: str) -> bool:
+    """Return whether rendering a node would only copy it."""
+    if node is None:
+        return True
+    elif isinstance(node, dict):
+        return all(
+            _is_static(k, tackle_gen) and _is_static(v, tackle_gen)
+            for k, v in node.items()
         )
-        render_context.update(special_variables)
-    return render_context
+    elif isinstance(node, list):
+        return all(_is_static(v, tackle_gen) for v in node)
+    elif isinstance(node, six.string_types):
+        if is_template(node):
+            return False
+        return tackle_gen == 'cookiecutter' or not is_literal(node)
+    # Other scalars are rendered as strings and only some are evaluated back
+    return tackle_gen != 'cookiecutter' and type(node) in (bool, int)
+
+
+def contains_template(context: 'Context', node: Any) -> bool:
+    """Return whether a node of the input has anything to render.
+
+    The result is cached per input node for the run so that hook dicts, ie
+    within loops, are only inspected once.
+    """
+    if context.template_cache is None:
+        context.template_cache = TemplateCache()
+    flag = context.template_cache.node_flags.get(node, context.tackle_gen)
+    if flag is None:
+        flag = not _is_static(node, context.tackle_gen)
+        context.template_cache.node_flags.set(node, context.tackle_gen, flag)
+    return flag
+
+
+def copy_node(node: Any):
+    """Copy the containers of a static node the same way rendering would."""
+    if isinstance(node, dict):
+        return {k: copy_node(v) for k, v in node.items()}
+    elif isinstance(node, list):
+        return [copy_node(v) for v in node]
+    return node
+
+
+def render_native(template, render_context: Mapping):
+    """Render a template compiled by a `NativeStrictEnvironment`.
+
+    When the template is a single expression the referenced object is returned
+    as is, otherwise the nodes are concatenated into a string.
+    """
+    ctx = new_shared_context(template, render_context)
+    try:
+        nodes = template.root_render_func(ctx)
+        head = list(islice(nodes, 2))
+        if len(head) == 1:
+            if isinstance(head[0], Undefined):
+                # Make the strict undefined raise
+                str(head[0])
+            if type(head[0]).__module__.startswith('jinja2.'):
+                # Jinja's own objects, ie `{{ self }}`, are only meant as strings
+                return str(head[0])
+            return head[0]
+        return ''.join([str(v) for v in chain(head, nodes)])
+    except Exception:
+        return template.environment.handle_exception()
 
 
 def render_variable(context: 'Context', raw: Any):
@@ -41,6 +196,12 @@ def render_variable(context: 'Context', raw: Any):
 
     This is then presented to the user as the default.
 
+    Strings without any template markers skip Jinja entirely. For tackle
+    generation, templates are rendered to native types so `{{ colors }}`
+    returns the referenced object itself while cookiecutter renders strings.
+    A single expression evaluating to `None` therefore renders as `None`, not
+    as the string `'None'`.
+
     :param Environment env: A Jinja2 Environment object.
     :param raw: The next value to be prompted for by the user.
     :param dict cc_dict: The current context as it's gradually
@@ -59,31 +220,24 @@ def render_variable(context: 'Context', raw: Any):
     elif not isinstance(raw, six.string_types):
         raw = str(raw)
 
-    env = StrictEnvironment(context=context.input_dict)
-    template = env.from_string(raw)
+    if not is_template(raw):
+        return evaluate_literal(context, raw)
+
+    if context.template_cache is None:
+        context.template_cache = TemplateCache()
+    native = context.tackle_gen != 'cookiecutter'
+    env = get_environment(context, native=native)
+    template = context.template_cache.get_template(env.registry_key, raw, lambda: env)
 
     # Build both the {{ cookiecutter.var }} and {{ var }} contexts
     render_context = build_render_context(context)
-    rendered_template = template.render(render_context)
-
-    # Tackle evaluates dicts, lists, and bools as literals where as cookiecutter
-    # renders them to string
-    if context.tackle_gen == 'cookiecutter':
-        return rendered_template
-
-    REGEX = [
-        r'^\[.*\]$',  # List
-        r'^\{.*\}$',  # Dict
-        r'^True$|^False$',  # Boolean
-        r'^\d+$',  # Integer
-        r'^[+-]?([0-9]+([.][0-9]*)?|[.][0-9]+)$',  # Float
-    ]
-    for r in REGEX:
-        try:
-            if bool(re.search(r, rendered_template)):
-                """If variable looks like list, return literal list"""
-                return ast.literal_eval(rendered_template)
-        except ValueError as e:
-            raise e
-
-    return rendered_template
+    if not native:
+        return render_template(template, render_context)
+
+    rendered = render_native(template, render_context)
+    if isinstance(rendered, six.string_types):
+        return evaluate_literal(context, rendered)
+    if isinstance(rendered, OutputView):
+        # Don't nest a view of the output in itself
+        return dict(rendered)
+    return rendered
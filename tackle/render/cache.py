@@ -0,0 +1,134 @@
+"""Compiled template cache used while rendering."""
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMPLATE_CACHE_SIZE = 4096
+DEFAULT_NODE_CACHE_SIZE = 4096
+
+# Returned by `NodeCache.get` on a miss
+_MISSING = object()
+
+
+class NodeCache(object):
+    """LRU cache of values computed from nodes of the input, ie unhashable dicts.
+
+    Entries are keyed by the id of the node along with a tag and keep a
+    reference to the node. Its id can't be reused by another object while the
+    entry exists and a hit requires the very same node, so once a node is
+    evicted and its id reused by a new object the new object misses instead of
+    getting a stale value.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_NODE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, node, tag=None, default=None):
+        """Return the value of a node, `default` if it isn't cached."""
+        key = (id(node), tag)
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING or entry[0] is not node:
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, node, tag, value):
+        """Cache the value of a node, evicting the least recently used ones."""
+        with self._lock:
+            self._entries[(id(node), tag)] = (node, value)
+            self._entries.move_to_end((id(node), tag))
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class TemplateCache(object):
+    """LRU cache of compiled Jinja templates scoped to a single run.
+
+    Templates are keyed by the environment settings they were compiled with and
+    the raw source string so that identical strings are only parsed and compiled
+    once no matter how many times they are rendered.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_TEMPLATE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+        # Whether input nodes contain anything to render
+        self.node_flags = NodeCache()
+        # Compiled hook dicts, see `tackle.parser.plan.HookNode`
+        self.hook_nodes = NodeCache()
+
+    def __len__(self):
+        return len(self._templates)
+
+    def get_template(self, env_key, source: str, env_factory):
+        """Return the compiled template for `source`, compiling it on a miss.
+
+        :param env_key: Hashable key describing the environment settings.
+        :param source: The raw template string.
+        :param env_factory: Callable returning the environment to compile with.
+        """
+        key = (env_key, source)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return template
+            self.misses += 1
+
+        template = env_factory().from_string(source)
+
+        with self._lock:
+            self._templates[key] = template
+            if len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+        return template
+
+    def preload(self, env_key, source: str, env, code):
+        """Add a template from code compiled ahead of time, ie from a plan on disk.
+
+        :param code: Code object returned by the environment's `compile`.
+        """
+        key = (env_key, source)
+        with self._lock:
+            if key in self._templates:
+                return
+        template = env.template_class.from_code(env, code, env.make_globals(None))
+
+        with self._lock:
+            self._templates[key] = template
+            if len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+
+    def clear(self):
+        """Drop all the compiled templates and reset the counters."""
+        with self._lock:
+            self._templates.clear()
+            self.node_flags.clear()
+            self.hook_nodes.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        """Return the hit / miss counters for logging."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._templates),
+            'maxsize': self.maxsize,
+        }
@@ -0,0 +1,85 @@
+"""Read-only views used as the context when rendering."""
+from collections import ChainMap
+from collections.abc import Mapping
+
+from tackle.render.special_vars import LazyVars
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tackle.models import Context
+
+
+class OutputView(Mapping):
+    """Read-only view of the output dict that never copies it.
+
+    Prints like a dict so that `{{ this }}` renders the same as it would with a
+    copy of the output.
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return repr(dict(self._data))
+
+
+class RenderContext(ChainMap):
+    """Layered read-only view used as the context when rendering.
+
+    The layers are the special variables, the context key alias and the output,
+    in that order of precedence. It is built once per context and writes to the
+    output are seen without rebuilding it. Special variables are only computed
+    when a template looks them up.
+    """
+
+    state = None
+    output = None
+    special = None
+
+    @classmethod
+    def from_context(cls, context: 'Context') -> 'RenderContext':
+        """Build the view for a context."""
+        output = OutputView(context.output_dict)
+        special = LazyVars(context, {'this': output, 'output': output})
+        if context.tackle_gen == 'cookiecutter':
+            # Cookiecutter templates have always been given the output itself
+            render_context = cls(special, {'cookiecutter': context.output_dict})
+        else:
+            render_context = cls(
+                special, {context.context_key: output}, context.output_dict
+            )
+        render_context.state = cls.context_state(context)
+        render_context.output = output
+        render_context.special = special
+        return render_context
+
+    @staticmethod
+    def context_state(context: 'Context') -> tuple:
+        """Return what the view depends on to know when to rebuild it."""
+        return (
+            id(context.output_dict),
+            context.context_key,
+            context.tackle_gen,
+            context.calling_directory,
+        )
+
+    def __setitem__(self, key, value):
+        raise TypeError("The render context is read-only.")
+
+    def __delitem__(self, key):
+        raise TypeError("The render context is read-only.")
@@ -1,9 +1,32 @@
 """Jinja2 environment and extensions loading."""
+import threading
 
 from jinja2 import Environment, StrictUndefined
+from jinja2.nativetypes import NativeEnvironment
 
 from tackle.exceptions import UnknownExtension
 
+DEFAULT_EXTENSIONS = [
+    'tackle.render.extensions.JsonifyExtension',
+    'tackle.render.extensions.RandomStringExtension',
+    'tackle.render.extensions.SlugifyExtension',
+    'jinja2_time.TimeExtension',
+]
+
+
+def read_extensions(context):
+    """Return list of extensions as str to be passed on to the Jinja2 env.
+
+    If context does not contain the relevant info, return an empty
+    list instead.
+    """
+    try:
+        extensions = context['cookiecutter']['_extensions']
+    except (KeyError, TypeError):
+        return []
+    else:
+        return [str(ext) for ext in extensions]
+
 
 class ExtensionLoaderMixin(object):
     """Mixin providing sane loading of extensions specified in a given context.
@@ -23,13 +46,7 @@ class ExtensionLoaderMixin(object):
         """
         context = kwargs.pop('context', {})
 
-        default_extensions = [
-            'tackle.render.extensions.JsonifyExtension',
-            'tackle.render.extensions.RandomStringExtension',
-            'tackle.render.extensions.SlugifyExtension',
-            'jinja2_time.TimeExtension',
-        ]
-        extensions = default_extensions + self._read_extensions(context)
+        extensions = DEFAULT_EXTENSIONS + self._read_extensions(context)
 
         try:
             super(ExtensionLoaderMixin, self).__init__(extensions=extensions, **kwargs)
@@ -42,12 +59,7 @@ class ExtensionLoaderMixin(object):
         If context does not contain the relevant info, return an empty
         list instead.
         """
-        try:
-            extensions = context['cookiecutter']['_extensions']
-        except (KeyError, TypeError):
-            return []
-        else:
-            return [str(ext) for ext in extensions]
+        return read_extensions(context)
 
 
 class StrictEnvironment(ExtensionLoaderMixin, Environment):
@@ -63,3 +75,63 @@ class StrictEnvironment(ExtensionLoaderMixin, Environment):
         Also loading extensions defined in cookiecutter.json's _extensions key.
         """
         super(StrictEnvironment, self).__init__(undefined=StrictUndefined, **kwargs)
+
+
+class NativeStrictEnvironment(ExtensionLoaderMixin, NativeEnvironment):
+    """Create strict Jinja2 environment rendering to native python types.
+
+    Used by tackle generation so that a template made of a single expression,
+    ie `{{ colors }}`, returns the referenced object instead of its string.
+    """
+
+    def __init__(self, **kwargs):
+        """Set the native StrictEnvironment with the same extensions loading."""
+        super(NativeStrictEnvironment, self).__init__(
+            undefined=StrictUndefined, **kwargs
+        )
+
+
+class EnvironmentRegistry(object):
+    """Registry of the Jinja2 environments used within a run.
+
+    Each distinct configuration, ie the extensions to load and the keyword
+    arguments to the environment, is only built once so that the extensions are
+    imported and instantiated a single time per run.
+    """
+
+    def __init__(self):
+        self._environments = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._environments)
+
+    @staticmethod
+    def environment_key(context=None, native=False, **kwargs) -> tuple:
+        """Return the hashable key of an environment configuration."""
+        return (
+            native,
+            tuple(read_extensions(context)),
+            tuple(sorted((k, repr(v)) for k, v in kwargs.items())),
+        )
+
+    def get_environment(
+        self, context=None, native=False, **kwargs
+    ) -> StrictEnvironment:
+        """Return the environment for the configuration, building it once.
+
+        :param context: Dict to read the `_extensions` from.
+        :param native: Build a `NativeStrictEnvironment` instead.
+        :param kwargs: Keyword arguments passed to the environment.
+        """
+        key = self.environment_key(context, native, **kwargs)
+        env = self._environments.get(key)
+        if env is None:
+            with self._lock:
+                env = self._environments.get(key)
+                if env is None:
+                    env_class = NativeStrictEnvironment if native else StrictEnvironment
+                    env = env_class(context=context, **kwargs)
+                    env.registry_key = key
+                    self._environments[key] = env
+        return env
@@ -1,23 +1,37 @@
 """Jinja2 extensions."""
 import json
 import string
+from collections.abc import Mapping
 from secrets import choice
 
 from jinja2.ext import Extension
 from slugify import slugify as pyslugify
 
 
+def json_default(obj):
+    """Serialize the read-only views of the output, which are mappings but not dicts."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 class JsonifyExtension(Extension):
-    """Jinja2 extension to convert a Python object to JSON."""
+    """Jinja2 extension to convert a Python object to JSON.
+
+    Also lets Jinja's own `tojson` filter serialize the views of the output.
+    """
 
     def __init__(self, environment):
         """Initialize the extension with the given environment."""
         super(JsonifyExtension, self).__init__(environment)
 
         def jsonify(obj):
-            return json.dumps(obj, sort_keys=True, indent=4)
+            return json.dumps(obj, sort_keys=True, indent=4, default=json_default)
 
         environment.filters['jsonify'] = jsonify
+        environment.policies['json.dumps_kwargs'] = dict(
+            environment.policies['json.dumps_kwargs'], default=json_default
+        )
 
 
 class RandomStringExtension(Extension):
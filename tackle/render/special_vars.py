@@ -2,6 +2,8 @@
 
 import os
 import platform
+from collections.abc import Mapping
+from functools import lru_cache
 
 import distro
 
@@ -34,11 +36,10 @@ def get_linux_distribution():
         return None
 
 
-def get_vars(context: 'Context'):
-    """Get special variables."""
-    vars = {
-        'cwd': os.getcwd(),
-        'home_dir': os.path.expanduser('~'),
+@lru_cache(maxsize=None)
+def _get_host_vars() -> dict:
+    """Compute the facts about the host once per process."""
+    host_vars = {
         'system': platform.system(),
         'platform': platform.platform(),
         'release': platform.release(),
@@ -46,11 +47,6 @@ def get_vars(context: 'Context'):
         'processor': platform.processor(),
         'architecture': platform.architecture(),
         'lsb_release': get_linux_distribution(),
-        'calling_directory': context.calling_directory,
-        'key': context.context_key,
-        'tackle_gen': context.tackle_gen,
-        'this': dict(context.output_dict),
-        'output': context.output_dict,
     }
     if platform.system() == 'Linux':
         linux_id_name, linux_version, linux_codename = distro.linux_distribution(
@@ -61,13 +57,98 @@ def get_vars(context: 'Context'):
             'linux_version': linux_version,
             'linux_codename': linux_codename,
         }
-        vars.update(linux_vars)
+        host_vars.update(linux_vars)
     else:
         linux_vars = {
             'linux_id_name': None,
             'linux_version': None,
             'linux_codename': None,
         }
-        vars.update(linux_vars)
+        host_vars.update(linux_vars)
+    return host_vars
+
+
+def get_host_vars() -> dict:
+    """Return the facts about the host, ie the platform and linux distribution.
+
+    These can't change while running so they are only computed once per process,
+    call `refresh_host_vars` to compute them again.
+    """
+    return dict(_get_host_vars())
+
+
+def refresh_host_vars() -> dict:
+    """Clear the cached facts about the host and compute them again."""
+    _get_host_vars.cache_clear()
+    return get_host_vars()
+
+
+HOST_VARS = (
+    'system',
+    'platform',
+    'release',
+    'version',
+    'processor',
+    'architecture',
+    'lsb_release',
+    'linux_id_name',
+    'linux_version',
+    'linux_codename',
+)
+
+
+def _host_var(name: str):
+    return lambda context: _get_host_vars()[name]
+
+
+# Functions computing each special variable from the context
+SPECIAL_VARS = {
+    'cwd': lambda context: os.getcwd(),
+    'home_dir': lambda context: os.path.expanduser('~'),
+    'calling_directory': lambda context: context.calling_directory,
+    'key': lambda context: context.context_key,
+    'tackle_gen': lambda context: context.tackle_gen,
+    'this': lambda context: context.output_dict,
+    'output': lambda context: context.output_dict,
+}
+SPECIAL_VARS.update({name: _host_var(name) for name in HOST_VARS})
 
-    return vars
+
+class LazyVars(Mapping):
+    """Special variables that are only computed when they are looked up.
+
+    Rendering a template that doesn't reference any special variable doesn't
+    compute any of them. Values are not kept so ie `cwd` is always current.
+
+    :param overrides: Values to use instead of computing some of the variables.
+    """
+
+    def __init__(self, context: 'Context', overrides: dict = None):
+        self.context = context
+        self.overrides = overrides or {}
+
+    def __getitem__(self, key):
+        if key in self.overrides:
+            return self.overrides[key]
+        return SPECIAL_VARS[key](self.context)
+
+    def __contains__(self, key):
+        return key in self.overrides or key in SPECIAL_VARS
+
+    def __iter__(self):
+        yield from SPECIAL_VARS
+        for key in self.overrides:
+            if key not in SPECIAL_VARS:
+                yield key
+
+    def __len__(self):
+        return len(SPECIAL_VARS.keys() | self.overrides.keys())
+
+    def copy(self) -> dict:
+        """Return all the variables computed into a dict."""
+        return dict(self)
+
+
+def get_vars(context: 'Context') -> dict:
+    """Get special variables."""
+    return dict(LazyVars(context))
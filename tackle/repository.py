@@ -142,7 +142,9 @@ def repository_has_tackle_file(repo_directory: str, context_file=None):
         return None
 
 
-def update_source(source: 'Source', settings: 'Settings', mode: 'Mode') -> 'Source':
+def update_source(
+    source: 'Source', settings: 'Settings', mode: 'Mode', clones: dict = None
+) -> 'Source':
     """
     Locate the repository directory from a template reference.
 
@@ -159,6 +161,8 @@ def update_source(source: 'Source', settings: 'Settings', mode: 'Mode') -> 'Sour
     :param no_input: Prompt the user at command line for manual configuration?
     :param password: The password to use when extracting the repository.
     :param directory: Directory within repo where cookiecutter.json lives.
+    :param clones: Directories already cloned to by `(url, checkout)`, ie by the
+        other runs of a `tackle.session.Session`, updated with the clone.
     :return: A tuple containing the cookiecutter template directory, and
         a boolean descriving whether that directory should be cleaned up
         after the template has been instantiated.
@@ -177,12 +181,17 @@ def update_source(source: 'Source', settings: 'Settings', mode: 'Mode') -> 'Sour
         repository_candidates = [unzipped_dir]
         source.cleanup = True
     elif is_repo_url(source.template):
-        cloned_repo = clone(
-            repo_url=source.template,
-            checkout=source.checkout,
-            clone_to_dir=settings.tackle_dir,
-            no_input=mode.no_input,
-        )
+        if clones is None:
+            clones = {}
+        cloned_repo = clones.get((source.template, source.checkout))
+        if cloned_repo is None:
+            cloned_repo = clone(
+                repo_url=source.template,
+                checkout=source.checkout,
+                clone_to_dir=settings.tackle_dir,
+                no_input=mode.no_input,
+            )
+            clones[(source.template, source.checkout)] = cloned_repo
         repository_candidates = [cloned_repo]
     elif is_file(source.template):
         from pathlib import Path
@@ -0,0 +1,265 @@
+"""Long lived server running tackle for local clients."""
+import errno
+import hmac
+import http.server
+import inspect
+import json
+import logging
+import os
+import secrets
+import socket
+import socketserver
+import stat
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+from tackle.main import tackle
+from tackle.session import get_process_session, run_in_worker
+
+logger = logging.getLogger(__name__)
+
+# Arguments of `tackle.main.tackle` holding the state of a calling run
+EXCLUDED_KWARGS = (
+    'template_cache',
+    'env_registry',
+    'fingerprints',
+    'journal',
+    'session',
+    'providers',
+)
+RUN_KWARGS = tuple(
+    i for i in inspect.signature(tackle).parameters if i not in EXCLUDED_KWARGS
+)
+# Hosts the requests can be addressed to, others are rejected so that web pages
+# can't have browsers post to the server, ie through DNS rebinding
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+
+def _is_local(url: str) -> bool:
+    """Return whether a URL, or `//<host header>`, is on localhost."""
+    try:
+        return urlsplit(url).hostname in LOCAL_HOSTS
+    except ValueError:
+        return False
+
+
+def _run_request(cwd: str, kwargs: dict) -> dict:
+    """Run a request in a worker and return its response."""
+    try:
+        return {'cwd': cwd, 'output': run_in_worker(cwd, kwargs), 'error': None}
+    except Exception as e:
+        logger.debug(f"Run failed - {e}")
+        return {'cwd': cwd, 'output': None, 'error': f"{e.__class__.__name__}: {e}"}
+
+
+class TackleRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Handler of the requests to a tackle server.
+
+    - `GET /health` returns `{"status": "ok"}`.
+    - `POST /run` takes a JSON object of arguments to `tackle.main.tackle` and
+      an optional `cwd` to run from, defaulting to a new temporary directory.
+      It returns the `cwd`, the `output` of the run and its `error` if it failed.
+
+    Requests need to be addressed to localhost, come from no other origin and
+    `POST /run` to have a `application/json` content type, which browsers can't
+    send across origins without asking first. When the server has a token, the
+    requests also need to send it as `Authorization: Bearer <token>`.
+    """
+
+    def _authorize(self) -> bool:
+        """Send an error unless the request is from a local client, see the class."""
+        if not _is_local('//' + self.headers.get('Host', '')):
+            self._send(403, {'error': "Requests must be addressed to localhost."})
+            return False
+        origin = self.headers.get('Origin')
+        if origin is not None and not _is_local(origin):
+            self._send(403, {'error': f"Requests from {origin} aren't allowed."})
+            return False
+        token = self.server.token
+        if token is not None and not hmac.compare_digest(
+            self.headers.get('Authorization', ''), f"Bearer {token}"
+        ):
+            self._send(401, {'error': "Missing or invalid token."})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._authorize():
+            return
+        if self.path != '/health':
+            return self._send(404, {'error': f"Unknown path {self.path}."})
+        self._send(200, {'status': 'ok'})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError as e:
+            return self._send(400, {'error': f"Invalid request - {e}"})
+        # Read before responding so that clients can send the whole request
+        body = self.rfile.read(length)
+        if not self._authorize():
+            return
+        if self.path != '/run':
+            return self._send(404, {'error': f"Unknown path {self.path}."})
+        content_type = self.headers.get('Content-Type', '')
+        if content_type.split(';')[0].strip().lower() != 'application/json':
+            return self._send(415, {'error': "Requests must be application/json."})
+        try:
+            kwargs = json.loads(body or b'{}')
+        except ValueError as e:
+            return self._send(400, {'error': f"Invalid request - {e}"})
+        if not isinstance(kwargs, dict):
+            return self._send(400, {'error': "Request must be a JSON object."})
+
+        cwd = kwargs.pop('cwd', None) or tempfile.mkdtemp(prefix='tackle-')
+        unknown = [i for i in kwargs if i not in RUN_KWARGS]
+        if unknown:
+            return self._send(400, {'error': f"Unknown arguments {unknown}."})
+        # Nobody to prompt
+        kwargs['no_input'] = True
+        kwargs.setdefault('calling_directory', cwd)
+
+        response = self.server.executor.submit(_run_request, cwd, kwargs).result()
+        self._send(200 if response['error'] is None else 500, response)
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Clients of unix sockets have no address
+        return str(self.client_address[0]) if self.client_address else 'local'
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class TackleServerMixin(socketserver.ThreadingMixIn):
+    """Server handing the runs to a pool of worker processes."""
+
+    daemon_threads = True
+    executor: ProcessPoolExecutor = None
+    token: str = None
+
+
+class TackleHTTPServer(TackleServerMixin, http.server.HTTPServer):
+    """Tackle server listening on a TCP port."""
+
+
+class TackleUnixServer(TackleServerMixin, socketserver.UnixStreamServer):
+    """Tackle server listening on a unix socket."""
+
+
+def remove_stale_socket(path: str):
+    """Remove a unix socket left over by a server that was killed.
+
+    Raises if the path isn't a socket or a server is still listening on it.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"Can't listen on {path}, it isn't a socket.")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            pass
+        else:
+            raise OSError(errno.EADDRINUSE, f"A server is already listening on {path}.")
+    os.remove(path)
+
+
+def make_server(
+    executor: ProcessPoolExecutor,
+    socket_path: str = None,
+    host: str = '127.0.0.1',
+    port: int = 8000,
+    token: str = None,
+) -> TackleServerMixin:
+    """Return a tackle server running its requests with an executor.
+
+    :param socket_path: Unix socket to listen on instead of `host` and `port`,
+        only accessible to the user.
+    :param token: Token the requests need to send, see `TackleRequestHandler`.
+    """
+    if socket_path:
+        remove_stale_socket(socket_path)
+        # Create the socket without permissions for the group and others
+        umask = os.umask(0o177)
+        try:
+            server = TackleUnixServer(socket_path, TackleRequestHandler)
+        finally:
+            os.umask(umask)
+    else:
+        server = TackleHTTPServer((host, port), TackleRequestHandler)
+    server.executor = executor
+    server.token = token
+    return server
+
+
+def write_token(path: str) -> str:
+    """Write a new token to a file only readable by the user and return it."""
+    token = secrets.token_urlsafe(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    # In case the file already existed
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(token)
+    return token
+
+
+def start_workers(executor: ProcessPoolExecutor, workers: int):
+    """Fork the worker processes of an executor from this thread.
+
+    Executors only fork them when given their first task, which would otherwise
+    be from the thread of a request while others are running.
+    """
+    for future in [executor.submit(int) for _ in range(workers)]:
+        future.result()
+
+
+def serve(
+    socket_path: str = None,
+    host: str = '127.0.0.1',
+    port: int = 8000,
+    workers: int = None,
+    token_file: str = None,
+):
+    """
+    Serve tackle runs to local clients until interrupted.
+
+    The modules of tackle are imported and the session of this process created
+    before the worker processes are forked, before serving any request, so that
+    they start warm. Each worker then reuses its session, ie its providers and
+    compiled templates, for all the runs it is given.
+
+    :param socket_path: Unix socket to listen on instead of `host` and `port`.
+    :param host: Host to listen on, only on localhost by default.
+    :param port: Port to listen on.
+    :param workers: Number of worker processes, defaults to the number of CPUs.
+    :param token_file: File to write a new token to that the requests then need
+        to send, see `TackleRequestHandler`.
+    """
+    token = write_token(token_file) if token_file else None
+    get_process_session()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        start_workers(executor, workers or os.cpu_count() or 1)
+        server = make_server(
+            executor, socket_path=socket_path, host=host, port=port, token=token
+        )
+        logger.info(f"Serving tackle on {socket_path or f'http://{host}:{port}'}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if socket_path and os.path.exists(socket_path):
+                os.remove(socket_path)
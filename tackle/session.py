@@ -0,0 +1,146 @@
+"""Session sharing the settings, providers and caches of tackle runs."""
+import copy
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from tackle.models import Settings
+from tackle.parser.settings import get_settings
+from tackle.render.cache import TemplateCache
+from tackle.render.environment import EnvironmentRegistry
+from tackle.utils.hook_cache import HookResultCache
+from tackle.utils.reader import read_config_file
+
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Arguments of `tackle.main.tackle` setting the settings of a session
+SETTINGS_KWARGS = ('config_file', 'env_file', 'config', 'default_config')
+# Number of files whose contents and plans are kept by a session
+DEFAULT_SESSION_CACHE_SIZE = 256
+
+
+class LRUDict(OrderedDict):
+    """Dict keeping only its `maxsize` most recently used items."""
+
+    def __init__(self, maxsize: int = DEFAULT_SESSION_CACHE_SIZE):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+class Session(object):
+    """Warmed state reused by the tackle runs of a process, ie nested tackle runs.
+
+    A run started without a session gets a new one, the tackle hook then starts
+    its nested runs within the session of the calling run so that they skip
+    reading the settings, gathering the providers and parsing the files that were
+    already read by an earlier run. Sessions outliving a run, ie the one of a
+    worker process, only keep the most recently used files and forget the
+    repositories cloned by a run with `new_run`.
+
+    :param settings: Settings of the runs, defaults to the user's settings.
+    :param template_cache: A `TemplateCache` to share compiled templates with.
+    :param env_registry: An `EnvironmentRegistry` to share Jinja environments with.
+    """
+
+    def __init__(
+        self,
+        settings: Settings = None,
+        template_cache: TemplateCache = None,
+        env_registry: EnvironmentRegistry = None,
+    ):
+        self.settings = settings or get_settings()
+        self.template_cache = template_cache or TemplateCache()
+        self.env_registry = env_registry or EnvironmentRegistry()
+        self.hook_cache = (
+            HookResultCache(self.settings.hook_cache_dir, self.settings.hook_cache_size)
+            if self.settings.hook_cache_dir
+            else None
+        )
+        # Native and settings providers, gathered by the first run
+        self.providers = None
+        # Directories the repositories were cloned to by `(url, checkout)` in the
+        # current run, see `new_run`
+        self.clones = {}
+        # Plans of the context files by their path in the `plans_dir`
+        self.plans = LRUDict()
+        self._configs = LRUDict()
+        self._lock = threading.Lock()
+
+    def new_run(self):
+        """Start a new top level run, cloning the repositories it uses again.
+
+        The repositories can have changed since an earlier run while the runs
+        nested in a run use the same clones.
+        """
+        with self._lock:
+            self.clones.clear()
+
+    def read_config_file(self, path: str, file_extension: str = None) -> Any:
+        """Return a copy of the contents of a file, parsed once until modified."""
+        path = os.path.abspath(path)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            # Raised by the reader
+            return read_config_file(path, file_extension)
+        with self._lock:
+            cached = self._configs.get((path, file_extension))
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, read_config_file(path, file_extension))
+            with self._lock:
+                self._configs[(path, file_extension)] = cached
+        else:
+            logger.debug(f"Using the parsed contents of {path}.")
+        # Inputs are modified while parsing, ie by the overwrites
+        return copy.deepcopy(cached[1])
+
+
+# Session of the runs of a worker process, see `get_process_session`
+_process_session = None
+
+
+def get_process_session() -> Session:
+    """Return the session shared by the runs of this process with the default config.
+
+    Worker processes forked after the session was warmed, ie by a first run in
+    the calling process, start with its settings, providers and caches.
+    """
+    global _process_session
+    if _process_session is None:
+        _process_session = Session()
+    return _process_session
+
+
+def run_in_worker(cwd: str, kwargs: dict) -> dict:
+    """Run tackle in a worker process from the working directory of the caller.
+
+    Runs share the session of the worker process so that only the first run of a
+    worker reads the settings and gathers the providers, unless they are given
+    their own config. Each run clones the remote templates it uses again.
+
+    :param cwd: Working directory to run from, the process' own.
+    :param kwargs: Arguments to `tackle.main.tackle`.
+    """
+    from tackle.main import tackle
+
+    os.chdir(cwd)
+    if not any(kwargs.get(i) for i in SETTINGS_KWARGS):
+        session = get_process_session()
+        session.new_run()
+        kwargs = dict(kwargs, session=session)
+    return dict(tackle(**kwargs))
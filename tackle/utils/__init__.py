@@ -1,6 +1,7 @@
 """Utils."""
+import asyncio
 import copy
-from functools import wraps
+from functools import partial, wraps
 import errno
 import os
 import signal
@@ -41,6 +42,12 @@ def merge_configs(default, overwrite):
     return new_config
 
 
+async def run_in_thread(func, *args, **kwargs):
+    """Await a blocking function run in the event loop's default thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+
+
 # https://stackoverflow.com/a/2282656/12642712
 class TimeoutError(Exception):
     """Exception for timeouts."""
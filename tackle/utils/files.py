@@ -8,6 +8,18 @@ import os
 from tackle.utils.paths import make_sure_path_exists
 
 
+class NoAliasDumper(yaml.Dumper):
+    """Yaml dumper writing objects shared between keys out in full.
+
+    Natively rendered values can reference the same object from several keys
+    which would otherwise be dumped as anchors and aliases.
+    """
+
+    def ignore_aliases(self, data):
+        """Never use aliases."""
+        return True
+
+
 def get_file_name(replay_dir, template_name, suffix='yaml'):
     """Get the name of file."""
     suffix = '.' + suffix if not template_name.endswith('.' + suffix) else ''
@@ -27,7 +39,7 @@ def dump(output_dir, output_name, output_dict, dump_output='yaml'):
             json.dump(output_dict, f, indent=2)
     if dump_output in ['yaml', 'yml']:
         with open(replay_file, 'w') as f:
-            yaml.dump(output_dict, f, indent=2)
+            yaml.dump(output_dict, f, indent=2, Dumper=NoAliasDumper)
 
 
 def load(replay_dir, template_name, context_key):
@@ -0,0 +1,113 @@
+"""Store of the results of hooks run with the `cache` base method."""
+import logging
+import os
+import pickle
+import threading
+import time
+
+from typing import Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class HookResultCache(object):
+    """Content addressed store of hook results on disk.
+
+    Results are stored in `<path>/<key[:2]>/<key>.pickle` where the key is a hash
+    of everything the result depends on, see `BaseHook.cache_key`. The mtime of
+    a result's file is its last use and once the store is over `max_size` bytes
+    the least recently used results are evicted.
+
+    :param path: Directory to store the results in.
+    :param max_size: Size in bytes to keep the store under, unbounded if None.
+    """
+
+    def __init__(self, path: str, max_size: int = None):
+        self.path = path
+        self.max_size = max_size
+        # Size of the store, only computed once something is stored
+        self.size = None
+        self.lock = threading.Lock()
+
+    def _result_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key + '.pickle')
+
+    def get(self, key: str, ttl: int = None) -> Tuple[bool, Any]:
+        """Return whether a result is stored and valid, and the result.
+
+        :param ttl: Seconds a result is valid for after it was stored.
+        """
+        result_path = self._result_path(key)
+        try:
+            with open(result_path, 'rb') as f:
+                created, value = pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception as e:
+            logger.debug(f"Unable to read the hook result {result_path} - {e}")
+            return False, None
+
+        if ttl is not None and time.time() - created > ttl:
+            logger.debug(f"Hook result {key} expired.")
+            return False, None
+        try:
+            # Mark it as used for the eviction
+            os.utime(result_path)
+        except OSError:
+            pass
+        return True, value
+
+    def set(self, key: str, value: Any):
+        """Store a result, evicting the least recently used ones if needed."""
+        result_path = self._result_path(key)
+        try:
+            data = pickle.dumps((time.time(), value))
+        except Exception as e:
+            logger.debug(f"Unable to store the hook result {key} - {e}")
+            return
+        try:
+            os.makedirs(os.path.dirname(result_path), exist_ok=True)
+            tmp_path = f"{result_path}.{os.getpid()}.{threading.get_ident()}"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, result_path)
+        except OSError as e:
+            logger.debug(f"Unable to write the hook result {result_path} - {e}")
+            return
+
+        if self.max_size is None:
+            return
+        with self.lock:
+            if self.size is None:
+                self.size = sum(os.path.getsize(i) for i, _ in self._iter_results())
+            else:
+                self.size += len(data)
+            if self.size > self.max_size:
+                self.evict()
+
+    def _iter_results(self):
+        """Yield the paths and mtimes of the stored results."""
+        for d in os.scandir(self.path):
+            if not d.is_dir():
+                continue
+            for f in os.scandir(d.path):
+                if f.name.endswith('.pickle'):
+                    try:
+                        yield f.path, f.stat().st_mtime
+                    except FileNotFoundError:
+                        continue
+
+    def evict(self):
+        """Remove the least recently used results until under the max size."""
+        results = sorted(self._iter_results(), key=lambda x: x[1])
+        self.size = sum(os.path.getsize(i) for i, _ in results)
+        for result_path, _ in results:
+            if self.size <= self.max_size:
+                break
+            try:
+                size = os.path.getsize(result_path)
+                os.remove(result_path)
+            except OSError:
+                continue
+            self.size -= size
+            logger.debug(f"Evicted the hook result {result_path}.")
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `tackle.batch`."""
+import json
+import os
+
+import pytest
+
+from tackle.batch import read_rows, tackle_batch
+
+
+@pytest.mark.parametrize('rows_file', ['rows.jsonl', 'rows.csv'])
+def test_batch_read_rows(change_dir, rows_file):
+    """Verify rows are read from JSON lines and CSV files."""
+    assert read_rows(rows_file) == [{'name': 'a'}, {'name': 'broken'}, {'name': 'c'}]
+
+
+def test_batch_tackle_batch(change_dir, tmpdir):
+    """Verify each row is run and its output or error written to the manifest."""
+    manifest = os.path.join(str(tmpdir), 'manifest.jsonl')
+    entries = tackle_batch('rows.jsonl', manifest=manifest, workers=2)
+    assert [i['row'] for i in entries] == [0, 1, 2]
+    assert entries[0]['output']['greeting'] == 'hello a'
+    assert entries[0]['error'] is None
+    assert entries[1]['output'] is None
+    assert entries[1]['error'].startswith('UndefinedVariableInTemplate')
+    assert entries[2]['output']['greeting'] == 'hello c'
+
+    with open(manifest) as f:
+        written = [json.loads(i) for i in f]
+    assert [i['error'] is None for i in written] == [True, False, True]
+    assert written[2]['overwrite_inputs'] == {'name': 'c'}
+
+
+def test_batch_restores_cwd(change_dir, tmpdir, mocker):
+    """Verify the working directory is restored after the row run in process."""
+
+    def run_in_worker(cwd, kwargs):
+        os.chdir(str(tmpdir))
+        return {}
+
+    mocker.patch('tackle.batch.run_in_worker', side_effect=run_in_worker)
+    cwd = os.getcwd()
+    entries = tackle_batch([{'name': 'a'}])
+    assert entries[0]['output'] == {}
+    assert os.getcwd() == cwd
+
+
+def test_batch_cli(change_dir, tmpdir, cli_runner):
+    """Verify the batch option of the CLI exits with an error for failed rows."""
+    manifest = os.path.join(str(tmpdir), 'manifest.jsonl')
+    result = cli_runner('.', '--batch', 'rows.csv', '--batch-manifest', manifest)
+    assert result.exit_code == 1
+    assert result.output.startswith('Ran 3 rows, 1 failed.')
+    assert os.path.isfile(manifest)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `tackle.parser.checkpoint`."""
+import os
+import pickle
+import pytest
+
+from tackle.main import tackle
+
+
+@pytest.fixture()
+def checkpoint_file(tmpdir):
+    """Journal the keys in a temporary file."""
+    return os.path.join(str(tmpdir), 'tackle.checkpoint.pickle')
+
+
+@pytest.fixture()
+def data_file(tmpdir):
+    """Path to the file read by the nested run, missing until written."""
+    return os.path.join(str(tmpdir), 'data.yaml')
+
+
+def read_journal(path):
+    """Return the keys and outputs of a journal."""
+    records = {}
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                key, _, output = pickle.load(f)
+            except EOFError:
+                return records
+            records[key[-1]] = output
+
+
+def test_parser_checkpoint_resume(change_dir, checkpoint_file, data_file):
+    """Verify a failed run is resumed from the key that failed in a nested run."""
+    with pytest.raises(FileNotFoundError):
+        tackle(
+            no_input=True,
+            checkpoint=checkpoint_file,
+            overwrite_inputs={'data_file': data_file},
+        )
+    journal = read_journal(checkpoint_file)
+    assert list(journal) == ['before', 'merged', 'skipped', 'nested_before']
+    assert journal['merged'] == {'merged_before': journal['before']['before']}
+    assert journal['skipped'] == {}
+
+    with open(data_file, 'w') as f:
+        f.write('stuff: things')
+    o = tackle(
+        no_input=True,
+        checkpoint=checkpoint_file,
+        resume=True,
+        overwrite_inputs={'data_file': data_file},
+    )
+    assert o['before'] == journal['before']['before']
+    # Merged values are restored
+    assert o['after_merged'] == o['before']
+    assert 'skipped' not in o
+    assert o['nested']['nested_before'] == journal['nested_before']['nested_before']
+    assert o['nested']['data'] == {'stuff': 'things'}
+    assert 'after' in o
+    # Removed once the run completes
+    assert not os.path.exists(checkpoint_file)
+
+
+def test_parser_checkpoint_without_resume(change_dir, checkpoint_file, data_file):
+    """Verify the journal is only restored when resuming."""
+    with pytest.raises(FileNotFoundError):
+        tackle(
+            no_input=True,
+            checkpoint=checkpoint_file,
+            overwrite_inputs={'data_file': data_file},
+        )
+    journal = read_journal(checkpoint_file)
+
+    with open(data_file, 'w') as f:
+        f.write('stuff: things')
+    o = tackle(
+        no_input=True,
+        checkpoint=checkpoint_file,
+        overwrite_inputs={'data_file': data_file},
+    )
+    assert o['before'] != journal['before']['before']
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of the hooks per second in a 10,000 iteration `var` loop.
+
+Run from the root of the repo with `python tests/parser/hooks/benchmark_hooks.py`
+to track the overhead of running a hook. Besides the loop, it times
+instantiating the hook with and without validating the hook dict, see
+`tackle.models.BaseHook`.
+"""
+import os
+import time
+
+from tackle.main import tackle
+from tackle.models import Context, Mode, Source
+from tackle.parser.hooks import build_hook
+from tackle.providers.system.hooks.variable import VarHook  # noqa: F401
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+ITERATIONS = 10000
+
+
+def benchmark_loop(repeat: int = 3) -> float:
+    """Return the best hooks per second of running the loop."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tackle(FIXTURES, context_file='loops-benchmark.yaml', no_input=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return ITERATIONS / best
+
+
+def benchmark_build_hook(trusted: bool) -> float:
+    """Return the hooks per second of instantiating the `var` hook."""
+    context = Context(output_dict={'items': list(range(ITERATIONS))})
+    mode = Mode(no_input=True)
+    source = Source()
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        context.hook_dict = {'type': 'var', 'input': i}
+        build_hook(context, mode, source, trusted=trusted)
+    return ITERATIONS / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    print(f"loop:                 {benchmark_loop():10.0f} hooks/s")
+    print(f"build_hook validated: {benchmark_build_hook(False):10.0f} hooks/s")
+    print(f"build_hook trusted:   {benchmark_build_hook(True):10.0f} hooks/s")
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
-
 """Tests dict input objects for `cookiecutter.operator.lists` module."""
 import os
+from glob import glob
 import pytest
 from tackle.main import tackle
 from tackle.exceptions import HookCallException
@@ -86,3 +86,124 @@ def test_parser_hooks_raises_error_on_bad_hook_input_type(change_curdir_fixtures
 #
 #     assert len(left_over_operators) == 0
 #     assert len(operator_types) == len(set(operator_types))
+
+
+def test_parser_hooks_loops_parallel(change_curdir_fixtures):
+    """Verify loops with `loop_workers` keep the order of the items."""
+    output = tackle('.', no_input=True, context_file='loops-parallel.yaml')
+    assert output['list_str_parallel'] == ['0-cats\n', '1-dogs\n', '2-chickens\n']
+    assert output['list_str_parallel_reversed'] == ['chickens', 'dogs', 'cats']
+    assert 'item' not in output
+    assert 'index' not in output
+
+
+def test_parser_hooks_loops_parallel_collects_errors(change_curdir_fixtures):
+    """Verify all the items are run and the errors are raised together."""
+    with pytest.raises(HookCallException) as e:
+        tackle('.', no_input=True, context_file='loops-parallel-errors.yaml')
+    assert 'index=0' in str(e.value)
+    assert 'index=1' in str(e.value)
+
+
+def test_parser_hooks_build_hook_shares_context():
+    """Verify hooks take the context by reference and validate their own fields."""
+    from collections import OrderedDict
+    from tackle.models import Context, Mode, Source
+    from tackle.parser.hooks import build_hook
+    from tackle.providers.system.hooks.print import PrintHook
+
+    output = OrderedDict({'big': list(range(1000))})
+    context = Context(output_dict=output, hook_dict={'type': 'print', 'out': 'foo'})
+    hook = build_hook(context, Mode(no_input=True), Source())
+    assert isinstance(hook, PrintHook)
+    assert hook.output_dict is context.output_dict
+    assert hook.no_input
+    assert hook.out == 'foo'
+
+    context.hook_dict = {'type': 'print', 'out': 'foo', 'stuff': 'things'}
+    with pytest.raises(HookCallException):
+        build_hook(context, Mode(), Source())
+
+
+def test_parser_hooks_build_hook_trusted():
+    """Verify trusted hooks skip validation only for shapes validated before."""
+    from tackle.models import Context, Mode, Source, get_hook_fields
+    from tackle.parser.hooks import build_hook
+    from tackle.providers.system.hooks.strings import SplitHook
+
+    context = Context(hook_dict={'type': 'split', 'input': 'a.b'})
+    build_hook(context, Mode(), Source(), trusted=True)
+    assert (('type', str), ('input', str)) in get_hook_fields(SplitHook).shapes
+
+    hook = build_hook(context, Mode(), Source(), trusted=True)
+    assert hook.input == 'a.b'
+    assert hook.separator == '.'
+
+    context.hook_dict = {'type': 'split', 'input': {'a': 1}}
+    with pytest.raises(ValidationError):
+        build_hook(context, Mode(), Source(), trusted=True)
+
+
+def test_parser_hooks_loops_batch(change_curdir_fixtures, monkeypatch):
+    """Verify loops of hooks implementing `execute_batch` are run in one call."""
+    from tackle.providers.system.hooks.strings import SplitHook
+
+    def execute(self):
+        raise Exception("Should be run in a batch.")
+
+    monkeypatch.setattr(SplitHook, 'execute', execute)
+
+    o = tackle('.', no_input=True, context_file='loops-batch.yaml')
+    assert o['split'] == [['foo', 'stuff'], ['bar', 'stuff']]
+    assert o['exists'] == [True, False]
+    assert o['update'] == [{'foo': 'bar', 'index': 0}, {'foo': 'bar', 'index': 1}]
+    assert o['var'] == [['a'], ['c']]
+
+
+def test_parser_hooks_loops_stream(change_curdir_fixtures, cleanup_loops):
+    """Verify loops over generators in chunks and writing to a sink."""
+    import json
+
+    o = tackle('.', no_input=True, context_file='loops-stream.yaml')
+    assert o['upper'] == ['FOO', 'BAR', 'BAZ']
+    assert o['threaded'] == ['0-FOO', '1-BAR', '2-BAZ']
+    # Only used by a loop so it is read as the loop runs and then removed
+    assert 'lines' not in o
+    # Used by more than the loop so it is read into a list
+    assert o['listed'] == ['foo', 'bar', 'baz']
+    assert o['listed_upper'] == o['upper']
+    assert o['listed_count'] == 3
+    assert o['streamed'] == 'loops/output-stream.jsonl'
+    with open(o['streamed']) as f:
+        lines = [json.loads(i) for i in f]
+    assert lines == [{'index': i, 'item': v} for i, v in enumerate(o['upper'])]
+
+
+def test_parser_hooks_loops_stream_record(change_curdir_fixtures, cleanup_loops):
+    """Verify runs looping over generators can be recorded."""
+    o = tackle('.', no_input=True, context_file='loops-stream.yaml', record=True)
+    assert o['upper'] == ['FOO', 'BAR', 'BAZ']
+    assert os.path.isfile('loops-stream.record.yaml')
+    os.remove('loops-stream.record.yaml')
+
+
+def test_parser_hooks_cache(change_curdir_fixtures, cleanup_loops, monkeypatch, tmpdir):
+    """Verify the results of hooks with `cache` are reused."""
+    monkeypatch.setenv('TACKLE_HOOK_CACHE_DIR', str(tmpdir))
+    with open(os.path.join('loops', 'output-cache-dep.txt'), 'w') as f:
+        f.write('foo')
+
+    first = tackle('.', no_input=True, context_file='cache.yaml')
+    second = tackle('.', no_input=True, context_file='cache.yaml')
+    assert first['cached'] == second['cached']
+    assert first['not_cached'] != second['not_cached']
+    assert first['cached_with_file'] == second['cached_with_file']
+    assert first['cached_loop'] == second['cached_loop'] == ['a', 'b', 'c']
+    # The two hooks and each item of the loop
+    assert len(glob(os.path.join(str(tmpdir), '*', '*.pickle'))) == 5
+
+    with open(os.path.join('loops', 'output-cache-dep.txt'), 'w') as f:
+        f.write('bar')
+    third = tackle('.', no_input=True, context_file='cache.yaml')
+    assert first['cached'] == third['cached']
+    assert first['cached_with_file'] != third['cached_with_file']
@@ -0,0 +1,15 @@
+"""Hook with a random output that declares itself reusable."""
+import uuid
+
+from tackle.models import BaseHook
+
+
+class ReusableHook(BaseHook):
+    """Return a random hex whose length is the sum of the lengths of the inputs."""
+
+    type: str = 'reusable'
+    reusable = True
+    inputs: list = []
+
+    def execute(self):
+        return uuid.uuid4().hex[: 8 + sum(len(str(i)) for i in self.inputs)]
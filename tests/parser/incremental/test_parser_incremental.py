@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `tackle.parser.incremental`."""
+import os
+import pytest
+
+from tackle.main import tackle
+
+
+@pytest.fixture()
+def incremental_file(tmpdir):
+    """Record the fingerprints in a temporary file."""
+    return os.path.join(str(tmpdir), 'tackle.incremental.pickle')
+
+
+def test_parser_incremental_reuses_unchanged_keys(change_dir, incremental_file):
+    """Verify hooks are only run again when their inputs change."""
+    first = tackle(no_input=True, incremental=incremental_file)
+    assert os.path.isfile(incremental_file)
+    assert 'skipped' not in first
+
+    second = tackle(no_input=True, incremental=incremental_file)
+    for key in ('unchanged', 'dependent', 'calling'):
+        assert second[key] == first[key]
+    assert second['nested']['nested_unchanged'] == first['nested']['nested_unchanged']
+    # Hooks not declaring themselves reusable always run
+    assert second['not_reusable'] != first['not_reusable']
+
+    third = tackle(
+        no_input=True,
+        incremental=incremental_file,
+        overwrite_inputs={'stuff': 'other'},
+    )
+    assert third['unchanged'] == first['unchanged']
+    assert third['nested']['nested_unchanged'] == first['nested']['nested_unchanged']
+    assert third['dependent'] != first['dependent']
+    assert len(third['dependent']) == 13
+
+
+def test_parser_incremental_tracks_special_variables(change_dir, incremental_file):
+    """Verify hooks referencing special variables run again when they change."""
+    first = tackle(no_input=True, incremental=incremental_file)
+    second = tackle(
+        no_input=True, incremental=incremental_file, calling_directory='elsewhere'
+    )
+    assert second['unchanged'] == first['unchanged']
+    assert second['calling'] != first['calling']
+
+
+def test_parser_incremental_runs_everything_without_it(change_dir, incremental_file):
+    """Verify the outputs aren't reused when not running incrementally."""
+    first = tackle(no_input=True, incremental=incremental_file)
+    second = tackle(no_input=True)
+    assert second['unchanged'] != first['unchanged']
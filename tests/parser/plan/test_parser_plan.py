@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `tackle.parser.plan`."""
+import os
+import pytest
+
+from tackle.main import tackle
+from tackle.models import Context
+from tackle.parser.plan import compile_hook
+
+EXPECTED = {
+    'stuff': 'things',
+    'var': 'things',
+    'looped': ['a-things', 'b-things'],
+    'skipped': 'things',
+}
+
+
+@pytest.fixture()
+def plans_dir(tmpdir, monkeypatch):
+    """Cache the plans in a temporary dir."""
+    monkeypatch.setenv('TACKLE_PLANS_DIR', str(tmpdir))
+    return tmpdir
+
+
+def test_parser_plan_is_cached(change_dir, plans_dir):
+    """Verify the plan of a file is written once and then reused."""
+    o = tackle(no_input=True)
+    for k, v in EXPECTED.items():
+        assert o[k] == v
+    plans = os.listdir(plans_dir)
+    assert len(plans) == 1
+
+    o = tackle(no_input=True)
+    for k, v in EXPECTED.items():
+        assert o[k] == v
+    assert os.listdir(plans_dir) == plans
+
+
+def test_parser_plan_compile_hook():
+    """Verify the control keys are split out without changing the hook dict."""
+    raw = {'type': 'var', 'input': 'foo', 'when': True, 'loop': [1]}
+    node = compile_hook(Context(), raw)
+    assert node.controls == {'when': True, 'loop': [1]}
+    assert node.fields == {'type': 'var', 'input': 'foo'}
+    assert not node.templated
+    assert raw == {'type': 'var', 'input': 'foo', 'when': True, 'loop': [1]}
+    assert compile_hook(Context(template_cache=None), raw) is not node
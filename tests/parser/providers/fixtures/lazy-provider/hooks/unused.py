@@ -0,0 +1,10 @@
+"""Hook that is never used so should never be imported."""
+from tackle.models import BaseHook
+
+raise RuntimeError("Imported a hook that isn't used.")
+
+
+class LazyUnusedHook(BaseHook):
+    """Hook that can't be imported."""
+
+    type: str = 'lazy_unused'
@@ -0,0 +1,13 @@
+"""Hook used in the context."""
+from tackle.models import BaseHook
+
+
+class LazyUsedHook(BaseHook):
+    """Hook returning its input."""
+
+    type: str = 'lazy_used'
+    stuff: str = None
+
+    def execute(self):
+        """Run the hook."""
+        return self.stuff
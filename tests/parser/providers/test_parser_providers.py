@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 """Tests dict input objects for `cookiecutter.parser.providers` module."""
+import os
 import pytest
 from tackle.main import tackle
 import subprocess
@@ -63,3 +64,63 @@ def test_parser_provider_hook_add_list(change_curdir_fixtures):
     o = tackle('.', context_file='context_provider_2.yaml')
     assert o['things'] == 'bar'
     assert o['stuff'] == 'bar'
+
+
+@pytest.fixture()
+def hook_registry():
+    """Fixture to remove the hooks registered by a test after it."""
+    from tackle.models import HOOK_REGISTRY
+
+    registry = dict(HOOK_REGISTRY)
+    yield HOOK_REGISTRY
+    HOOK_REGISTRY.clear()
+    HOOK_REGISTRY.update(registry)
+
+
+def test_parser_provider_hook_registry(hook_registry):
+    """Verify hooks are registered by type including subclasses of other hooks."""
+    from tackle.models import BaseHook, Context
+    from tackle.parser.providers import get_hook
+
+    class RegistryBaseHook(BaseHook):
+        foo: str = None
+
+    class RegistryHook(RegistryBaseHook, BaseHook):
+        type: str = 'registry_hook'
+
+    class RegistrySubHook(RegistryHook):
+        bar: str = None
+
+    assert get_hook('registry_hook', Context()) is RegistryHook
+    assert RegistrySubHook.__fields__['type'].default == 'registry_hook'
+
+
+def test_parser_provider_modules_imported_once(change_curdir_fixtures):
+    """Verify running again doesn't import the providers again."""
+    from tackle.models import HOOK_REGISTRY
+
+    tackle('.', context_file='context_provider.yaml')
+    hooks = dict(HOOK_REGISTRY)
+    o = tackle('.', context_file='context_provider.yaml')
+    assert o['things'] == 'bar'
+    assert all(HOOK_REGISTRY[k] is v for k, v in hooks.items())
+
+
+def test_parser_provider_imports_used_hooks_only(
+    change_curdir_fixtures, tmpdir, monkeypatch
+):
+    """Verify only the files defining the hooks in use are imported."""
+    import json
+
+    manifest_path = os.path.join(str(tmpdir), 'providers.json')
+    monkeypatch.setenv('TACKLE_PROVIDERS_MANIFEST', manifest_path)
+
+    o = tackle('.', context_file='lazy_provider.yaml')
+    assert o['things'] == 'bar'
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    hook_files = manifest[os.path.abspath(os.path.join('lazy-provider', 'hooks'))][
+        'hook_files'
+    ]
+    assert os.path.basename(hook_files['lazy_unused']) == 'unused.py'
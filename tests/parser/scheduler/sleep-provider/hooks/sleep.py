@@ -0,0 +1,31 @@
+"""Hooks sleeping and returning when they slept."""
+import asyncio
+import time
+
+from tackle.models import BaseHook
+
+
+class SleepHook(BaseHook):
+    """Sleep and return the start and end times of the sleep."""
+
+    type: str = 'sleep'
+    parallel_safe = True
+    seconds: float
+
+    def execute(self):
+        start = time.monotonic()
+        time.sleep(self.seconds)
+        return {'seconds': self.seconds, 'start': start, 'end': time.monotonic()}
+
+
+class AsyncSleepHook(BaseHook):
+    """Await asyncio.sleep and return the start and end times of the sleep."""
+
+    type: str = 'async_sleep'
+    parallel_safe = True
+    seconds: float
+
+    async def aexecute(self):
+        start = time.monotonic()
+        await asyncio.sleep(self.seconds)
+        return {'seconds': self.seconds, 'start': start, 'end': time.monotonic()}
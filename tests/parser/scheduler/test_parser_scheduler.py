@@ -0,0 +1,77 @@
+"""Tests for `tackle.parser.scheduler`."""
+import asyncio
+
+from tackle.main import tackle
+from tackle.models import BaseHook
+
+
+def overlap(a: dict, b: dict) -> bool:
+    """Return whether two sleeps returned by the test hooks overlapped."""
+    return a['start'] < b['end'] and b['start'] < a['end']
+
+
+def test_parser_scheduler_matches_serial_output(change_dir):
+    """Verify the output is the same and in the same order as running serially."""
+    serial = tackle(no_input=True)
+    scheduled = tackle(no_input=True, hook_workers=4)
+
+    def slept(output):
+        # Only the times of the sleeps differ
+        return [
+            (k, v['seconds'] if isinstance(v, dict) else v) for k, v in output.items()
+        ]
+
+    assert slept(scheduled) == slept(serial)
+    assert scheduled['third'] == '0.2 three\n'
+    assert 'sixth' not in scheduled
+    assert scheduled['last'] == 7
+
+
+def test_parser_scheduler_runs_hooks_concurrently(change_dir):
+    """Verify independent hooks don't wait for each other."""
+    output = tackle(context_file='sleep.yaml', no_input=True, hook_workers=4)
+
+    assert overlap(output['first'], output['second'])
+    assert overlap(output['third'], output['fourth'])
+    # Plain values wait for the hooks before them
+    assert output['third']['start'] >= output['first']['end']
+    assert output['third']['start'] >= output['second']['end']
+
+
+def test_parser_scheduler_runs_hooks_serially(change_dir):
+    """Verify hooks aren't run concurrently without workers."""
+    output = tackle(context_file='sleep.yaml', no_input=True)
+
+    assert not overlap(output['first'], output['second'])
+    assert not overlap(output['third'], output['fourth'])
+
+
+def test_parser_scheduler_awaits_async_hooks(change_dir):
+    """Verify hooks implementing `aexecute` are awaited together in one thread."""
+    output = tackle(context_file='async.yaml', no_input=True)
+    assert not overlap(output['first'], output['second'])
+    assert output['fourth']['seconds'] == 0.2
+
+    output = tackle(context_file='async.yaml', no_input=True, hook_workers=1)
+    # The first three sleep together and the fourth waits for the third
+    assert overlap(output['first'], output['second'])
+    assert overlap(output['second'], output['third'])
+    assert output['fourth']['start'] >= output['third']['end']
+    assert output['fourth']['seconds'] == 0.2
+
+
+def test_parser_scheduler_async_hook_execute():
+    """Verify async hooks can be executed from within a running event loop."""
+
+    class AsyncHook(BaseHook):
+        async def aexecute(self):
+            await asyncio.sleep(0)
+            return 'done'
+
+    hook = AsyncHook()
+    assert hook.execute() == 'done'
+
+    async def execute():
+        return hook.execute()
+
+    assert asyncio.run(execute()) == 'done'
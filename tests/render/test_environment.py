@@ -1,7 +1,7 @@
 """Collection of tests around loading extensions."""
 import pytest
 
-from tackle.render.environment import StrictEnvironment
+from tackle.render.environment import EnvironmentRegistry, StrictEnvironment
 from tackle.exceptions import UnknownExtension
 from tackle.main import tackle
 import os
@@ -35,3 +35,24 @@ def test_env_should_evaluate_is_defined(change_dir_main_fixtures):
     assert 'not_defined' not in o
     assert 'not_defined_again' not in o
     assert 'defined_again' in o
+
+
+def test_env_registry_builds_each_configuration_once():
+    """Verify the registry reuses environments with the same configuration."""
+    registry = EnvironmentRegistry()
+    env = registry.get_environment()
+
+    assert registry.get_environment() is env
+    assert registry.get_environment(keep_trailing_newline=True) is not env
+    assert len(registry) == 2
+
+
+def test_env_registry_loads_context_extensions():
+    """Verify `_extensions` from the context are part of the configuration."""
+    registry = EnvironmentRegistry()
+    context = {'cookiecutter': {'_extensions': ['jinja2.ext.do']}}
+    env = registry.get_environment(context)
+
+    assert 'jinja2.ext.ExprStmtExtension' in env.extensions
+    assert registry.get_environment() is not env
+    assert registry.get_environment(context) is env
@@ -0,0 +1,129 @@
+"""Tests for `tackle.render.render_variable`."""
+import json
+
+import pytest
+from jinja2.exceptions import UndefinedError
+
+from tackle.models import Context
+from tackle.render import render_variable, contains_template
+
+
+@pytest.fixture()
+def tackle_context():
+    """Return a tackle context with some output."""
+    return Context(
+        context_key='tackle',
+        tackle_gen='tackle',
+        output_dict={'foo': 'bar', 'count': 3},
+    )
+
+
+@pytest.mark.parametrize(
+    'raw,expected',
+    [
+        ('stuff', 'stuff'),
+        ('[1, 2]', [1, 2]),
+        ('{"a": 1}', {'a': 1}),
+        ('True', True),
+        ('12', 12),
+        ('1.5', 1.5),
+        (3, 3),
+        (False, False),
+    ],
+)
+def test_render_variable_literals(tackle_context, raw, expected):
+    """Verify literals are evaluated without being compiled."""
+    assert render_variable(tackle_context, raw) == expected
+    assert tackle_context.template_cache is None or (
+        tackle_context.template_cache.info()['misses'] == 0
+    )
+
+
+def test_render_variable_literals_cookiecutter():
+    """Verify cookiecutter generation keeps literals as strings."""
+    context = Context(context_key='cookiecutter', tackle_gen='cookiecutter')
+    assert render_variable(context, ['[1, 2]', 3, 'stuff']) == ['[1, 2]', '3', 'stuff']
+
+
+def test_render_variable_templates(tackle_context):
+    """Verify templates are still rendered and evaluated."""
+    assert render_variable(tackle_context, '{{ foo }}') == 'bar'
+    assert render_variable(tackle_context, '{{ count + 1 }}') == 4
+    assert render_variable(tackle_context, 'line\n') == 'line'
+
+
+def test_contains_template_is_cached_per_node(tackle_context):
+    """Verify hook dicts are only inspected once."""
+    static = {'type': 'var', 'input': ['a', {'b': 'c'}]}
+    templated = {'type': 'var', 'input': ['a', {'b': '{{ foo }}'}]}
+    literal = {'type': 'var', 'input': '[1, 2]'}
+
+    assert not contains_template(tackle_context, static)
+    assert contains_template(tackle_context, templated)
+    assert contains_template(tackle_context, literal)
+
+    flags = tackle_context.template_cache.node_flags
+    assert flags.get(static, 'tackle') is False
+    assert flags.get(dict(static), 'tackle') is None
+    assert len(flags) == 3
+
+
+def test_render_variable_native_returns_object(tackle_context):
+    """Verify single expressions return the referenced object without a copy."""
+    colors = ['red', 'blue']
+    tackle_context.output_dict['colors'] = colors
+
+    assert render_variable(tackle_context, '{{ colors }}') is colors
+    assert render_variable(tackle_context, '{{ colors | length }}') == 2
+    assert render_variable(tackle_context, '{{ colors }} and more') == (
+        "['red', 'blue'] and more"
+    )
+
+
+def test_render_variable_native_none(tackle_context):
+    """Verify a single expression evaluating to None isn't rendered as a string."""
+    tackle_context.output_dict['nothing'] = None
+
+    assert render_variable(tackle_context, '{{ nothing }}') is None
+    assert render_variable(tackle_context, '{{ nothing }} here') == 'None here'
+
+
+def test_render_variable_native_undefined(tackle_context):
+    """Verify undefined variables still raise in native rendering."""
+    with pytest.raises(UndefinedError):
+        render_variable(tackle_context, '{{ not_there }}')
+
+
+def test_render_variable_cookiecutter_renders_strings():
+    """Verify cookiecutter generation keeps rendering to strings."""
+    context = Context(
+        context_key='cookiecutter',
+        tackle_gen='cookiecutter',
+        output_dict={'colors': ['red']},
+    )
+    assert render_variable(context, '{{ cookiecutter.colors }}') == "['red']"
+
+
+def test_render_context_is_reused(tackle_context):
+    """Verify the render context is built once and sees new output."""
+    assert render_variable(tackle_context, '{{ foo }}') == 'bar'
+    render_context = tackle_context.render_context
+
+    tackle_context.output_dict['new'] = 'stuff'
+    assert render_variable(tackle_context, '{{ new }}') == 'stuff'
+    assert render_variable(tackle_context, '{{ this.new }}') == 'stuff'
+    assert tackle_context.render_context is render_context
+
+    tackle_context.output_dict = {'foo': 'baz'}
+    assert render_variable(tackle_context, '{{ foo }}') == 'baz'
+    assert tackle_context.render_context is not render_context
+
+
+@pytest.mark.parametrize('alias', ['this', 'output', 'tackle'])
+def test_render_variable_output_to_json(tackle_context, alias):
+    """Verify the views of the output can be serialized by the json filters."""
+    assert render_variable(tackle_context, f'x = {{{{ {alias} | tojson }}}}') == (
+        'x = {"count": 3, "foo": "bar"}'
+    )
+    rendered = render_variable(tackle_context, f'{{{{ [{alias}] | jsonify }}}}')
+    assert json.loads(rendered) == [{'count': 3, 'foo': 'bar'}]
@@ -15,3 +15,34 @@ def test_special_variables(change_dir):
 
     if output['linux_id_name'] == 'ubuntu':
         assert 'Ubuntu' in output['lsb_release']
+
+
+def test_special_variables_host_vars_cached(mocker):
+    """Verify the host facts are computed once until they are refreshed."""
+    from tackle.render import special_vars
+
+    special_vars.refresh_host_vars()
+    spy = mocker.spy(special_vars, 'get_linux_distribution')
+
+    first = special_vars.get_host_vars()
+    first['system'] = 'changed'
+    assert special_vars.get_host_vars()['system'] != 'changed'
+    assert spy.call_count == 0
+
+    special_vars.refresh_host_vars()
+    assert spy.call_count == 1
+
+
+def test_special_variables_lazy(mocker):
+    """Verify special variables are only computed when a template uses them."""
+    from tackle.models import Context
+    from tackle.render import render_variable, special_vars
+
+    cwd = mocker.Mock(return_value='here')
+    mocker.patch.dict(special_vars.SPECIAL_VARS, {'cwd': cwd})
+    context = Context(context_key='tackle', output_dict={'foo': 'bar'})
+
+    assert render_variable(context, '{{ foo }}') == 'bar'
+    assert cwd.call_count == 0
+    assert render_variable(context, '{{ cwd }}') == 'here'
+    assert cwd.call_count == 1
@@ -0,0 +1,71 @@
+"""Tests for the compiled template cache."""
+from tackle.models import Context
+from tackle.render import render_variable
+from tackle.render.cache import NodeCache, TemplateCache
+from tackle.render.environment import StrictEnvironment
+
+
+def test_template_cache_counts_hits_and_misses():
+    """Verify that the same source is only compiled once."""
+    cache = TemplateCache()
+    first = cache.get_template((), '{{ foo }}', StrictEnvironment)
+    second = cache.get_template((), '{{ foo }}', StrictEnvironment)
+
+    assert first is second
+    assert cache.info()['hits'] == 1
+    assert cache.info()['misses'] == 1
+
+
+def test_template_cache_keys_on_environment():
+    """Verify that the environment settings are part of the key."""
+    cache = TemplateCache()
+    first = cache.get_template((), '{{ foo }}', StrictEnvironment)
+    second = cache.get_template(('ext',), '{{ foo }}', StrictEnvironment)
+
+    assert first is not second
+    assert cache.info()['misses'] == 2
+
+
+def test_template_cache_evicts_least_recently_used():
+    """Verify the cache is bounded and evicts the oldest template."""
+    cache = TemplateCache(maxsize=2)
+    first = cache.get_template((), 'a', StrictEnvironment)
+    cache.get_template((), 'b', StrictEnvironment)
+    cache.get_template((), 'a', StrictEnvironment)
+    cache.get_template((), 'c', StrictEnvironment)
+
+    assert len(cache) == 2
+    assert cache.get_template((), 'a', StrictEnvironment) is first
+    assert cache.info()['misses'] == 3
+
+
+def test_render_variable_uses_template_cache():
+    """Verify repeated renders within a context reuse compiled templates."""
+    context = Context(
+        context_key='tackle',
+        tackle_gen='tackle',
+        output_dict={'foo': 'bar'},
+    )
+    for _ in range(3):
+        assert render_variable(context, ['{{ foo }}', '{{ foo }}']) == ['bar', 'bar']
+
+    assert context.template_cache.info()['misses'] == 1
+    assert context.template_cache.info()['hits'] == 5
+
+
+def test_node_cache_is_bounded_and_keyed_by_identity():
+    """Verify nodes are evicted and equal nodes don't share a value."""
+    cache = NodeCache(maxsize=2)
+    first, second, third = {'a': 1}, {'a': 1}, {'b': 2}
+    cache.set(first, 'tackle', True)
+    cache.set(second, 'tackle', False)
+
+    assert cache.get(second, 'tackle') is False
+    assert cache.get(first, 'tackle') is True
+    assert cache.get(first, 'cookiecutter') is None
+
+    cache.set(third, 'tackle', True)
+    assert len(cache) == 2
+    # Least recently used
+    assert cache.get(second, 'tackle') is None
+    assert cache.get(first, 'tackle') is True
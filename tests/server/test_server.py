@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `tackle.server`."""
+import http.client
+import json
+import os
+import socket
+import stat
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from tackle.server import (
+    make_server,
+    remove_stale_socket,
+    start_workers,
+    write_token,
+)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a unix socket."""
+
+    def __init__(self, path):
+        super().__init__('localhost')
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+@pytest.fixture(params=[{}, {'unix': True}], ids=['http', 'unix'])
+def connection(request, tmpdir):
+    """Run a server in a thread and return a function connecting to it."""
+    executor = ProcessPoolExecutor(max_workers=1)
+    token = request.param.get('token')
+    if request.param.get('unix'):
+        socket_path = os.path.join(str(tmpdir), 'tackle.sock')
+        server = make_server(executor, socket_path=socket_path, token=token)
+        connect = lambda: UnixHTTPConnection(socket_path)  # noqa
+    else:
+        server = make_server(executor, port=0, token=token)
+        connect = lambda: http.client.HTTPConnection(*server.server_address)  # noqa
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield connect
+    server.shutdown()
+    server.server_close()
+    thread.join()
+    executor.shutdown()
+
+
+def request(connect, method, path, body=None, headers=None):
+    """Return the status and JSON body of a response."""
+    conn = connect()
+    conn.request(
+        method,
+        path,
+        body=json.dumps(body) if body is not None else None,
+        headers={'Content-Type': 'application/json', **(headers or {})},
+    )
+    response = conn.getresponse()
+    data = json.loads(response.read())
+    conn.close()
+    return response.status, data
+
+
+def test_server_run(change_dir, connection, tmpdir):
+    """Verify runs are done from the working directory of the request."""
+    template = os.path.abspath('tackle.yaml')
+    status, data = request(connection, 'GET', '/health')
+    assert (status, data) == (200, {'status': 'ok'})
+
+    status, data = request(
+        connection,
+        'POST',
+        '/run',
+        {
+            'template': template,
+            'overwrite_inputs': {'name': 'things'},
+            'cwd': str(tmpdir),
+        },
+    )
+    assert status == 200
+    assert data['output']['greeting'] == 'hello things'
+
+    status, data = request(
+        connection, 'POST', '/run', {'template': template, 'record': True}
+    )
+    assert status == 200
+    assert data['output']['greeting'] == 'hello default'
+    # A new directory per request by default
+    assert data['cwd'] != str(tmpdir)
+    assert os.listdir(data['cwd']) == ['tackle.record.yaml']
+
+
+def test_server_errors(change_dir, connection):
+    """Verify invalid requests and failed runs are reported."""
+    status, data = request(connection, 'POST', '/run', {'stuff': 'things'})
+    assert status == 400
+    assert 'stuff' in data['error']
+
+    status, data = request(connection, 'POST', '/run', {'template': 'missing'})
+    assert status == 500
+    assert data['error'].startswith('RepositoryNotFound')
+
+    status, _ = request(connection, 'GET', '/stuff')
+    assert status == 404
+
+
+def test_server_rejects_other_sites(change_dir, connection):
+    """Verify requests that browsers could send from other sites are rejected."""
+    status, _ = request(connection, 'POST', '/run', {}, {'Content-Type': 'text/plain'})
+    assert status == 415
+
+    status, _ = request(connection, 'POST', '/run', {}, {'Host': 'example.com'})
+    assert status == 403
+
+    status, _ = request(
+        connection, 'POST', '/run', {}, {'Origin': 'http://example.com'}
+    )
+    assert status == 403
+
+    status, data = request(
+        connection, 'GET', '/health', headers={'Host': 'localhost:8000'}
+    )
+    assert (status, data) == (200, {'status': 'ok'})
+
+
+@pytest.mark.parametrize('connection', [{'token': 'secret'}], indirect=True)
+def test_server_token(connection):
+    """Verify the token of a server is required."""
+    status, _ = request(connection, 'GET', '/health')
+    assert status == 401
+
+    status, _ = request(
+        connection, 'GET', '/health', headers={'Authorization': 'Bearer other'}
+    )
+    assert status == 401
+
+    status, _ = request(
+        connection, 'GET', '/health', headers={'Authorization': 'Bearer secret'}
+    )
+    assert status == 200
+
+
+@pytest.mark.parametrize('connection', [{'unix': True}], indirect=True)
+def test_server_socket_permissions(connection, tmpdir):
+    """Verify the unix socket is only accessible to the user."""
+    mode = os.stat(os.path.join(str(tmpdir), 'tackle.sock')).st_mode
+    assert stat.S_IMODE(mode) == 0o600
+
+
+def test_server_write_token(tmpdir):
+    """Verify tokens are written to files only readable by the user."""
+    path = os.path.join(str(tmpdir), 'token')
+    with open(path, 'w') as f:
+        f.write('old')
+    os.chmod(path, 0o644)
+
+    token = write_token(path)
+    with open(path) as f:
+        assert f.read() == token
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_server_remove_stale_socket(tmpdir):
+    """Verify only sockets no server is listening on are removed."""
+    path = os.path.join(str(tmpdir), 'tackle.sock')
+    remove_stale_socket(path)
+
+    with open(path, 'w') as f:
+        f.write('stuff')
+    with pytest.raises(FileExistsError):
+        remove_stale_socket(path)
+    assert os.path.isfile(path)
+    os.remove(path)
+
+    listening = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listening.bind(path)
+    listening.listen()
+    with pytest.raises(OSError):
+        remove_stale_socket(path)
+    assert os.path.exists(path)
+
+    listening.close()
+    remove_stale_socket(path)
+    assert not os.path.exists(path)
+
+
+def test_server_cli(cli_runner, mocker):
+    """Verify the serve option serves instead of running a template."""
+    serve = mocker.patch('tackle.cli.cli_parser.tackle_serve')
+    result = cli_runner('--serve', '--serve-port', '8001')
+    assert result.exit_code == 0
+    serve.assert_called_once_with(
+        socket_path=None, port=8001, workers=None, token_file=None
+    )
+
+    # A template named serve is still run
+    serve.reset_mock()
+    cli_runner('serve', '--no-input')
+    serve.assert_not_called()
+
+
+def test_server_start_workers():
+    """Verify the workers are forked before any request is served."""
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        start_workers(executor, 2)
+        assert executor.submit(os.getpid).result() != os.getpid()
+        assert len(executor._processes) == 2
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `tackle.session`."""
+import os
+
+import tackle.main
+import tackle.session
+from tackle.main import tackle as run_tackle
+from tackle.session import Session
+
+
+def test_session_nested_runs(change_dir, mocker):
+    """Verify nested tackle runs reuse the settings and files of the session."""
+    get_settings = mocker.spy(tackle.main, 'get_settings')
+    read_config_file = mocker.spy(tackle.session, 'read_config_file')
+
+    output = run_tackle(no_input=True)
+    assert len(output['nested']) == 2
+    for i in output['nested']:
+        assert i['nested.yaml']['nested_stuff'] == 'things'
+        assert i['other.yaml']['nested_stuff'] == 'things'
+
+    assert get_settings.call_count == 1
+    read_files = [os.path.basename(i.args[0]) for i in read_config_file.mock_calls]
+    assert sorted(read_files) == ['nested.yaml', 'other.yaml', 'tackle.yaml']
+
+
+def test_session_read_config_file(tmpdir):
+    """Verify files are parsed again once modified and copies are returned."""
+    path = os.path.join(str(tmpdir), 'stuff.yaml')
+    with open(path, 'w') as f:
+        f.write('stuff: things')
+    session = Session()
+
+    contents = session.read_config_file(path)
+    contents['stuff'] = 'other'
+    assert session.read_config_file(path) == {'stuff': 'things'}
+
+    with open(path, 'w') as f:
+        f.write('stuff: other')
+    os.utime(path, (0, 0))
+    assert session.read_config_file(path) == {'stuff': 'other'}
+
+
+def test_session_files_are_bounded(tmpdir):
+    """Verify only the most recently used files are kept."""
+    session = Session()
+    session._configs.maxsize = 2
+    paths = []
+    for i in range(3):
+        paths.append(os.path.join(str(tmpdir), f'{i}.yaml'))
+        with open(paths[-1], 'w') as f:
+            f.write(f'stuff: {i}')
+
+    session.read_config_file(paths[0])
+    session.read_config_file(paths[1])
+    session.read_config_file(paths[0])
+    session.read_config_file(paths[2])
+    assert [os.path.basename(i[0]) for i in session._configs] == ['0.yaml', '2.yaml']
+
+
+def test_session_worker_runs_clone_again(change_dir, mocker):
+    """Verify runs in a worker don't reuse the clones of the earlier runs."""
+    session = Session()
+    session.clones[('https://example.com/stuff', None)] = 'stale'
+    mocker.patch('tackle.session.get_process_session', return_value=session)
+
+    output = tackle.session.run_in_worker(os.getcwd(), {'no_input': True})
+    assert output['stuff'] == 'things'
+    assert session.clones == {}
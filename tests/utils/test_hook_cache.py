@@ -0,0 +1,37 @@
+"""Tests for `tackle.utils.hook_cache`."""
+import os
+import time
+
+from tackle.utils.hook_cache import HookResultCache
+
+
+def test_hook_cache_get_set(tmpdir):
+    """Verify results are stored and expire after their ttl."""
+    cache = HookResultCache(str(tmpdir))
+    assert cache.get('abcd') == (False, None)
+
+    cache.set('abcd', {'foo': ['bar']})
+    assert cache.get('abcd') == (True, {'foo': ['bar']})
+    assert os.path.isfile(os.path.join(str(tmpdir), 'ab', 'abcd.pickle'))
+
+    time.sleep(0.05)
+    assert cache.get('abcd', ttl=0) == (False, None)
+    assert cache.get('abcd', ttl=60) == (True, {'foo': ['bar']})
+
+
+def test_hook_cache_evicts_least_recently_used(tmpdir):
+    """Verify the least recently used results are evicted over the max size."""
+    cache = HookResultCache(str(tmpdir))
+    cache.set('aaaa', 'x' * 100)
+    size = os.path.getsize(os.path.join(str(tmpdir), 'aa', 'aaaa.pickle'))
+
+    cache = HookResultCache(str(tmpdir), max_size=size * 2)
+    cache.set('bbbb', 'x' * 100)
+    os.utime(os.path.join(str(tmpdir), 'aa', 'aaaa.pickle'), (1, 1))
+    os.utime(os.path.join(str(tmpdir), 'bb', 'bbbb.pickle'), (2, 2))
+    cache.get('aaaa')
+    cache.set('cccc', 'x' * 100)
+
+    assert cache.get('aaaa')[0]
+    assert not cache.get('bbbb')[0]
+    assert cache.get('cccc')[0]